@@ -153,10 +153,10 @@ else:
 
     # Get recommendations based on user progress
     recommendations = db_utils.get_recommendations(
-        current_level, st.session_state.resources_completed)
+        current_level, st.session_state.resources_completed, limit=3)
 
     if recommendations:
-        for i, resource in enumerate(recommendations[:3]):
+        for i, resource in enumerate(recommendations):
             with st.expander(f"{i+1}. ✨ {resource['title']}"):
                 st.write(f"**📋 Type**: {resource['type']}")
                 st.write(f"**📝 Description**: {resource['description']}")
@@ -1,7 +1,7 @@
 import streamlit as st
+import code_runner
 import json
 import db_utils
-import os
 
 # Page configuration
 st.set_page_config(
@@ -61,6 +61,18 @@ selected_tag = st.sidebar.selectbox("Filter by Tag", unique_tags)
 if selected_tag != "All Tags":
     filtered_resources = [r for r in filtered_resources if 'tags' in r and selected_tag in r['tags']]
 
+# Full-text search (ranked, matches word prefixes)
+search_query = st.sidebar.text_input("Search Resources")
+if search_query:
+    # Filtered in the search itself, so the ranked matches are all ones this page can show
+    search_ids = db_utils.search_resources(
+        search_query, level='beginner',
+        type=None if selected_type == "All Types" else selected_type,
+        tag=None if selected_tag == "All Tags" else selected_tag)
+    search_rank = {resource_id: i for i, resource_id in enumerate(search_ids)}
+    filtered_resources = sorted([r for r in filtered_resources if r['id'] in search_rank],
+                                key=lambda r: search_rank[r['id']])
+
 # Display resources
 if filtered_resources:
     for resource in filtered_resources:
@@ -219,31 +231,19 @@ st.write("Edit the code below and run it to see the results.")
 user_code = st.text_area("Code Editor", value=code_examples[selected_example], height=200)
 
 if st.button("Run Code"):
-    try:
-        # Create a file
-        with open("temp_code.py", "w") as f:
-            f.write(user_code)
-        
-        # Capture stdout
-        import io
-        import sys
-        from contextlib import redirect_stdout
-        
-        f = io.StringIO()
-        with redirect_stdout(f):
-            exec(user_code)
-        output = f.getvalue()
-        
-        # Display output
-        st.subheader("Output:")
-        st.code(output)
-        
-    except Exception as e:
-        st.error(f"Error: {e}")
-    finally:
-        # Clean up
-        if os.path.exists("temp_code.py"):
-            os.remove("temp_code.py")
+    st.subheader("Output:")
+    output_area = st.empty()
+    
+    # Run in a sandboxed worker process, in a private scratch directory,
+    # showing output as it is produced
+    result = code_runner.run_code(user_code, on_output=output_area.code, user=st.session_state.username)
+    
+    # Display output
+    output_area.code(result.output)
+    if result.truncated:
+        st.warning(f"Output was cut off after {code_runner.OUTPUT_LIMIT // 1024} KB.")
+    if not result.ok:
+        st.error(f"Error: {result.error}")
 
 # Further resources
 st.header("Additional Learning Tips")
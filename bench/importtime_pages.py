@@ -0,0 +1,90 @@
+"""Import cost of rendering a page, as python -X importtime sees it
+
+Usage (from the repository root, with the app's dependencies installed):
+
+    python bench/importtime_pages.py progress.py projects.py
+
+Each page is rendered in a fresh interpreter started with -X importtime,
+through Streamlit's AppTest, after streamlit itself has been imported (as it
+is in the running server). Only imports triggered by the page are counted.
+Each page is rendered twice per scenario: as a logged-in user with no
+completions, and logged out.
+"""
+import os
+import re
+import subprocess
+import sys
+import time
+
+MARKER = '--- page render starts ---'
+RUNS = 5
+TOP = 8
+
+_line = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def _child(page, logged_in):
+    import streamlit  # noqa: F401  (already loaded in a running server)
+    from streamlit.testing.v1 import AppTest
+
+    # streamlit run puts the script's directory on sys.path
+    sys.path.insert(0, os.path.dirname(os.path.abspath(page)))
+    app = AppTest.from_file(page, default_timeout=60)
+    if logged_in:
+        app.session_state['username'] = 'bench'
+        app.session_state['current_level'] = 'beginner'
+        app.session_state['resources_completed'] = []
+    print(MARKER, file=sys.stderr, flush=True)
+    started = time.perf_counter()
+    app.run()
+    first = time.perf_counter() - started
+    started = time.perf_counter()
+    app.run()
+    rerun = time.perf_counter() - started
+    if app.exception:
+        raise SystemExit(f"{page} raised: {app.exception}")
+    print(f'{first} {rerun}')
+
+
+def _measure(page, logged_in):
+    """Return (first render s, rerun s, total import us, [(cumulative us, module)])"""
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', __file__, '--child', page, '1' if logged_in else '0'],
+        capture_output=True, text=True, check=True)
+    first, rerun = map(float, proc.stdout.split()[-2:])
+    imports = proc.stderr.split(MARKER, 1)[1]
+    top_level = []
+    for match in _line.finditer(imports):
+        _, cumulative, indent, module = match.groups()
+        # Only entries with no parent inside the page's imports
+        if len(indent) == 1:
+            top_level.append((int(cumulative), module))
+    return first, rerun, sum(us for us, _ in top_level), sorted(top_level, reverse=True)[:TOP]
+
+
+def _median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+
+def main(pages):
+    for page in pages:
+        for logged_in in (True, False):
+            runs = [_measure(page, logged_in) for _ in range(RUNS)]
+            first = _median(run[0] for run in runs)
+            rerun = _median(run[1] for run in runs)
+            imports = _median(run[2] for run in runs)
+            print(f"## {page} ({'logged in, no completions' if logged_in else 'logged out'})")
+            print(f"first render {first * 1000:.0f} ms, rerun {rerun * 1000:.0f} ms, "
+                  f"imports during first render {imports / 1000:.0f} ms (median of {RUNS})")
+            for us, module in runs[len(runs) // 2][3]:
+                print(f"  {us / 1000:8.1f} ms  {module}")
+            print()
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--child']:
+        _child(sys.argv[2], sys.argv[3] == '1')
+    else:
+        os.environ.setdefault('MPLBACKEND', 'Agg')
+        main(sys.argv[1:] or ['progress.py', 'projects.py'])
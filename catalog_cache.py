@@ -0,0 +1,72 @@
+import copy
+import threading
+import time
+
+# How long a cached catalog version is trusted before asking the source again.
+# Writes made in this process invalidate immediately; this only bounds how
+# long it takes to notice a catalog written by another process.
+VERSION_CHECK_INTERVAL = 30
+
+
+class CatalogCache:
+    """Process-wide cache for catalog data (resources, projects, ...)
+
+    Entries are stored together with the catalog version they were built from
+    and are only rebuilt when that version changes or the entry is invalidated.
+    """
+
+    def __init__(self, version_check_interval=VERSION_CHECK_INTERVAL):
+        self.version_check_interval = version_check_interval
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._versions = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, version_source, loader):
+        """Return the cached value for key, calling loader() on a miss
+
+        version_source is a zero-argument callable returning the current
+        catalog version. It is called at most once per version_check_interval.
+        Callers get a shallow copy of the cached list or dict; the items are shared.
+        """
+        now = time.monotonic()
+        with self._lock:
+            checked = self._versions.get(key)
+        if checked is not None and now - checked[1] < self.version_check_interval:
+            version = checked[0]
+        else:
+            version = version_source()
+            with self._lock:
+                self._versions[key] = (version, now)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self.hits += 1
+                return copy.copy(entry[1])
+            self.misses += 1
+
+        value = loader()
+        with self._lock:
+            self._entries[key] = (version, value)
+        return copy.copy(value)
+
+    def invalidate(self, key=None):
+        """Drop one cached entry, or all of them when key is None"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._versions.clear()
+            else:
+                self._entries.pop(key, None)
+                self._versions.pop(key, None)
+
+    def stats(self):
+        """Return hit/miss counters for monitoring"""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries)}
+
+
+# Shared by every page running in this process
+catalog_cache = CatalogCache()
@@ -0,0 +1,937 @@
+"""Sandboxed execution of learner code for the "Run Code" buttons
+
+Snippets run in a pool of pre-started worker processes instead of inside the
+Streamlit server, each run bounded by CPU, memory and wall-clock limits. A
+worker never runs a snippet itself: it forks a fresh child per run from its
+warm state, so nothing one learner's snippet changes (builtins, sys.modules,
+threads) is seen by the next run, and the child never holds the worker's
+connection to the server.
+"""
+import ast
+import builtins
+import hashlib
+import io
+import itertools
+import multiprocessing
+import os
+import queue
+import shutil
+import signal
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout, redirect_stderr
+from dataclasses import dataclass, replace
+
+POOL_SIZE = 4                       # worker processes kept warm
+QUEUE_LIMIT = 16                    # runs allowed to wait for a free worker
+WALL_TIME_LIMIT = 10                # seconds per run, including waiting on I/O or sleep
+CPU_TIME_LIMIT = 5                  # CPU seconds per run
+MEMORY_LIMIT = 512 * 1024 * 1024    # bytes of address space per worker
+WORKER_GRACE_TIME = 2               # extra seconds the server waits before giving up on a worker
+WORKSPACE_POOL_SIZE = 8             # clean scratch directories kept ready for reuse
+FILE_SIZE_LIMIT = 8 * 1024 * 1024   # bytes per file a snippet may write
+WORKSPACE_LIMIT = 32 * 1024 * 1024  # bytes of files a run may leave in its scratch directory
+WORKSPACE_CHECK_INTERVAL = 0.02     # seconds between scratch directory size checks
+TMPFS_MIN_FREE = 1024 * 1024 * 1024 # /dev/shm is only used for scratch space if this much of it is free
+PROCESS_LIMIT = 16                  # processes a run may have alive at once, its own included
+OUTPUT_LIMIT = 1024 * 1024          # bytes of output kept per run; the rest is dropped
+STREAM_CHUNK_SIZE = 16 * 1024       # buffered output is sent once it reaches this size...
+STREAM_INTERVAL = 0.05              # ...or after this many seconds
+USER_RUN_BURST = 5                  # runs a user can start back to back...
+USER_RUN_RATE = 0.2                 # ...refilled at this many runs per second (12 a minute)
+RATE_LIMIT_BUCKETS = 10000          # users tracked before idle (full) buckets are dropped
+JOB_RETENTION = 600                 # seconds a finished job's result stays available for polling
+JOB_POLL_INTERVAL = 0.5             # seconds between page reruns while a job is running
+COMPILE_CACHE_ENTRIES = 128         # compiled snippets kept per worker
+RESULT_CACHE_ENTRIES = 512          # cached results of deterministic snippets
+RESULT_CACHE_BYTES = 16 * 1024 * 1024
+RESULT_CACHE_ENTRY_BYTES = 256 * 1024
+
+# Imported once per worker at startup so snippets using them start fast
+# (the stdlib modules the page examples and project starters import)
+PRELOAD_MODULES = [
+    'asyncio', 'collections', 'contextlib', 'contextvars', 'datetime', 'dis', 'functools', 'gc',
+    'inspect', 'io', 'itertools', 'json', 'math', 'random', 're', 'string', 'time', 'types',
+]
+
+# Snippets importing only these modules always print the same thing, so their
+# results can be cached. Anything touching time, randomness, the filesystem or
+# the network is left out.
+DETERMINISTIC_MODULES = {
+    'abc', 'array', 'bisect', 'collections', 'contextlib', 'copy', 'dataclasses', 'decimal',
+    'enum', 'fractions', 'functools', 'heapq', 'itertools', 'json', 'math', 'operator', 're',
+    'statistics', 'string', 'textwrap', 'typing',
+}
+# Builtins whose result depends on the process or the outside world, and those
+# that reach other builtins by name (getattr(__builtins__, 'open'), globals()[...])
+NONDETERMINISTIC_BUILTINS = {
+    '__builtins__', '__import__', 'breakpoint', 'compile', 'eval', 'exec', 'getattr', 'globals', 'hash', 'id',
+    'input', 'locals', 'open', 'vars',
+}
+# Dunders a snippet may use without losing caching (the __main__ guard)
+DETERMINISTIC_DUNDERS = {'__name__', '__main__'}
+
+PR_SET_CHILD_SUBREAPER = 36         # prctl option, from <linux/prctl.h>
+
+
+@dataclass
+class ExecutionResult:
+    """Outcome of one run: status is 'ok', 'error', 'timeout', 'killed', 'rejected' or 'throttled'"""
+    status: str
+    output: str = ''
+    error: str = ''
+    duration: float = 0.0
+    cached: bool = False
+    truncated: bool = False
+
+    @property
+    def ok(self):
+        return self.status == 'ok'
+
+
+class RateLimiter:
+    """Token bucket per user: a burst of runs, then a steady refill rate"""
+
+    def __init__(self, burst=USER_RUN_BURST, rate=USER_RUN_RATE, max_buckets=RATE_LIMIT_BUCKETS):
+        self.burst = burst
+        self.rate = rate
+        self.max_buckets = max_buckets
+        self._lock = threading.Lock()
+        self._buckets = {}
+        self._pruned = float('-inf')
+
+    def acquire(self, user):
+        """Take a token for user; return 0 if allowed, else seconds until the next token"""
+        now = time.monotonic()
+        with self._lock:
+            # Checked whenever a bucket is added; at most once a second, as pruning walks every bucket
+            if user not in self._buckets and len(self._buckets) >= self.max_buckets and now - self._pruned >= 1:
+                self._prune(now)
+                self._pruned = now
+            tokens, updated = self._buckets.get(user, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            if tokens >= 1:
+                self._buckets[user] = (tokens - 1, now)
+                return 0
+            self._buckets[user] = (tokens, now)
+            return (1 - tokens) / self.rate
+
+    def _prune(self, now):
+        # A bucket idle long enough to be full again carries no state
+        full_after = self.burst / self.rate
+        for user, (_, updated) in list(self._buckets.items()):
+            if now - updated > full_after:
+                del self._buckets[user]
+
+
+class Job:
+    """A run submitted in the background; output fills in as the snippet prints"""
+
+    def __init__(self, job_id):
+        self.id = job_id
+        self.output = ''
+        self.result = None
+        self.finished_at = None
+        self._done = threading.Event()
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        """Block until the run finishes (or timeout passes) and return its result, if any"""
+        self._done.wait(timeout)
+        return self.result
+
+    def _finish(self, result):
+        self.output = result.output
+        self.result = result
+        self.finished_at = time.monotonic()
+        self._done.set()
+
+
+def _is_dunder(name):
+    return name.startswith('__') and name.endswith('__') and name not in DETERMINISTIC_DUNDERS
+
+
+def is_deterministic(code):
+    """Best-effort check that running code twice gives the same output
+
+    Errs towards False: besides the modules and builtins above, any dunder
+    name or attribute (x.__class__, __builtins__.open) and any string naming
+    one (operator.attrgetter('__dict__')) rules caching out, since they can
+    reach everything the lists exclude.
+    """
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        # The syntax error itself is deterministic
+        return True
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            modules = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            modules = [node.module or '']
+        elif isinstance(node, ast.Name) and (node.id in NONDETERMINISTIC_BUILTINS or _is_dunder(node.id)):
+            return False
+        elif isinstance(node, ast.Attribute) and _is_dunder(node.attr):
+            return False
+        elif (isinstance(node, ast.Constant) and isinstance(node.value, str)
+              and '__' in node.value and node.value not in DETERMINISTIC_DUNDERS):
+            return False
+        else:
+            continue
+        if any(module.split('.')[0] not in DETERMINISTIC_MODULES for module in modules):
+            return False
+    return True
+
+
+def cache_key(code, stdin=''):
+    """Hash of everything a deterministic run's output depends on"""
+    digest = hashlib.sha256()
+    for part in (code, sys.version, stdin):
+        digest.update(part.encode('utf-8', 'surrogatepass'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """LRU cache of ExecutionResults for deterministic snippets
+
+    Bounded both by entry count and by the total size of cached output.
+    """
+
+    def __init__(self, max_entries=RESULT_CACHE_ENTRIES, max_bytes=RESULT_CACHE_BYTES,
+                 max_entry_bytes=RESULT_CACHE_ENTRY_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.uncacheable = 0
+
+    @staticmethod
+    def _size(result):
+        return len(result.output) + len(result.error)
+
+    def get(self, key):
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, key, result):
+        size = self._size(result)
+        if size > self.max_entry_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= self._size(old)
+            self._entries[key] = result
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= self._size(evicted)
+
+    def skip(self):
+        """Count a run that was not eligible for caching"""
+        with self._lock:
+            self.uncacheable += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Return hit/miss counters and current size for monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {'hits': self.hits, 'misses': self.misses, 'uncacheable': self.uncacheable,
+                    'hit_rate': self.hits / lookups if lookups else 0.0,
+                    'entries': len(self._entries), 'bytes': self._bytes}
+
+
+def _apply_memory_limit(memory_limit):
+    try:
+        import resource
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+    except (ImportError, ValueError, OSError):
+        # Not available on this platform; the wall-clock limit still applies
+        pass
+
+
+def _apply_file_size_limit(file_size_limit):
+    """Cap the size of any one file; Python ignores SIGXFSZ, so oversized writes raise OSError"""
+    try:
+        import resource
+        resource.setrlimit(resource.RLIMIT_FSIZE, (file_size_limit, file_size_limit))
+    except (ImportError, ValueError, OSError):
+        pass
+
+
+def _apply_cpu_limit(cpu_time_limit):
+    """Allow cpu_time_limit more CPU seconds from now; past that the kernel kills the worker"""
+    try:
+        import resource
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        used = int(usage.ru_utime + usage.ru_stime) + 1
+        _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+        resource.setrlimit(resource.RLIMIT_CPU, (used + cpu_time_limit, hard))
+    except (ImportError, ValueError, OSError):
+        pass
+
+
+def _apply_process_limit(process_limit):
+    """Let this process's user start at most process_limit more processes or threads
+
+    RLIMIT_NPROC counts every task the user owns, so the limit is set relative
+    to what is running now. The kernel does not enforce it for root; the
+    worker's own count of a run's processes still applies there.
+    """
+    try:
+        import resource
+        uid = os.getuid()
+        if uid == 0:
+            return
+        tasks = 0
+        for pid in os.listdir('/proc'):
+            if not pid.isdigit():
+                continue
+            try:
+                if os.stat(f'/proc/{pid}').st_uid != uid:
+                    continue
+                with open(f'/proc/{pid}/stat') as f:
+                    # num_threads is the 20th field; comm (field 2) may contain spaces
+                    tasks += int(f.read().rsplit(')', 1)[1].split()[17])
+            except (OSError, IndexError, ValueError):
+                continue
+        _, hard = resource.getrlimit(resource.RLIMIT_NPROC)
+        limit = tasks + process_limit
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        resource.setrlimit(resource.RLIMIT_NPROC, (limit, hard))
+    except (ImportError, AttributeError, ValueError, OSError):
+        pass
+
+
+def _become_subreaper():
+    """Have processes orphaned below this one reparented to it instead of to init (Linux only)"""
+    if not sys.platform.startswith('linux'):
+        return
+    try:
+        import ctypes
+        ctypes.CDLL(None, use_errno=True).prctl(PR_SET_CHILD_SUBREAPER, 1, 0, 0, 0)
+    except (OSError, AttributeError):
+        pass
+
+
+def _child_pids(pid):
+    """Return the pids of pid's children, zombies included; empty where /proc cannot tell"""
+    children = []
+    try:
+        for tid in os.listdir(f'/proc/{pid}/task'):
+            with open(f'/proc/{pid}/task/{tid}/children') as f:
+                children.extend(int(child) for child in f.read().split())
+    except OSError:
+        pass
+    return children
+
+
+def _descendants(pid):
+    """Return the pids of every process below pid"""
+    found = []
+    pending = [pid]
+    while pending:
+        children = _child_pids(pending.pop())
+        found.extend(children)
+        pending.extend(children)
+    return found
+
+
+def _kill_descendants():
+    """SIGKILL and reap every process left below this worker
+
+    The worker is a child subreaper, so whatever a run orphaned (a daemon that
+    called setsid, say) is reparented here rather than to init and is found too.
+    Repeats until nothing is left, in case a process forked while being killed.
+    """
+    while True:
+        descendants = _descendants(os.getpid())
+        if not descendants:
+            break
+        for pid in descendants:
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except OSError:
+                pass
+        for pid in descendants:
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                # Not ours (yet): it is reaped once reparented, on the next pass
+                pass
+    # Without /proc (or on platforms without subreapers) at least reap what exited
+    while True:
+        try:
+            pid, _ = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            return
+        if pid == 0:
+            return
+
+
+def _tree_size(path):
+    """Total size of the files under path"""
+    total = 0
+    try:
+        entries = list(os.scandir(path))
+    except OSError:
+        return 0
+    for entry in entries:
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                total += _tree_size(entry.path)
+            else:
+                total += entry.stat(follow_symlinks=False).st_size
+        except OSError:
+            pass
+    return total
+
+
+def _scratch_root():
+    """Prefer tmpfs for scratch files so runs never touch the disk
+
+    Containers often give /dev/shm only 64 MB, which a few runs could fill
+    (breaking the server's own semaphores), so a small one is passed over.
+    """
+    try:
+        usage = os.statvfs('/dev/shm')
+        if os.access('/dev/shm', os.W_OK) and usage.f_bavail * usage.f_frsize >= TMPFS_MIN_FREE:
+            return '/dev/shm'
+    except (AttributeError, OSError):
+        pass
+    return tempfile.gettempdir()
+
+
+class WorkspacePool:
+    """Per-run scratch directories, recycled through a background cleaner
+
+    Each run gets a private, empty working directory, so files a snippet
+    creates never collide with another session's. Released directories are
+    emptied off the request path and handed out again.
+    """
+
+    def __init__(self, size=WORKSPACE_POOL_SIZE, root=None):
+        self.size = size
+        self.root = tempfile.mkdtemp(prefix='code-runner-', dir=root or _scratch_root())
+        self._names = itertools.count()
+        self._free = queue.Queue()
+        self._dirty = queue.Queue()
+        for _ in range(size):
+            self._free.put(self._new_dir())
+        threading.Thread(target=self._clean_loop, daemon=True).start()
+
+    def _new_dir(self):
+        path = os.path.join(self.root, f'run-{next(self._names)}')
+        os.mkdir(path)
+        return path
+
+    def acquire(self):
+        """Return an empty directory, creating one if none is ready"""
+        try:
+            return self._free.get_nowait()
+        except queue.Empty:
+            return self._new_dir()
+
+    def release(self, path):
+        """Give a directory back; it is emptied asynchronously"""
+        self._dirty.put(path)
+
+    def _clean_loop(self):
+        while True:
+            path = self._dirty.get()
+            if path is None:
+                return
+            try:
+                for entry in os.scandir(path):
+                    if entry.is_dir(follow_symlinks=False):
+                        shutil.rmtree(entry.path)
+                    else:
+                        os.unlink(entry.path)
+            except OSError:
+                shutil.rmtree(path, ignore_errors=True)
+                continue
+            if self._free.qsize() < self.size:
+                self._free.put(path)
+            else:
+                shutil.rmtree(path, ignore_errors=True)
+
+    def close(self):
+        self._dirty.put(None)
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+class _OutputStream(io.TextIOBase):
+    """stdout/stderr replacement that forwards output to the parent in chunks
+
+    Forwards at most OUTPUT_LIMIT bytes per run and drops everything written
+    after the limit is reached.
+    """
+
+    def __init__(self, conn, limit=OUTPUT_LIMIT):
+        self.conn = conn
+        self.limit = limit
+        self.written = 0
+        self.truncated = False
+        self.finished = False
+        self._buffer = []
+        self._buffered = 0
+        self._lock = threading.Lock()
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        with self._lock:
+            if self.finished or self.truncated:
+                return len(text)
+            data = text.encode('utf-8', 'replace')
+            if self.written + len(data) > self.limit:
+                data = data[:self.limit - self.written]
+                self.truncated = True
+            self._buffer.append(data.decode('utf-8', 'ignore'))
+            self.written += len(data)
+            self._buffered += len(data)
+            if self._buffered >= STREAM_CHUNK_SIZE:
+                self._send()
+        return len(text)
+
+    def flush(self):
+        with self._lock:
+            self._send()
+
+    def finish(self):
+        """Send what is left; output written after this (e.g. by stray threads) is dropped"""
+        with self._lock:
+            self._send()
+            self.finished = True
+
+    def _send(self):
+        if self._buffer and not self.finished:
+            self.conn.send({'type': 'output', 'data': ''.join(self._buffer)})
+        self._buffer = []
+        self._buffered = 0
+
+
+# Worker-side cache of compiled snippets, keyed by source hash
+_compiled = OrderedDict()
+
+
+def _compile(code):
+    """Compile code, reusing the code object from an earlier run of the same source"""
+    key = hashlib.sha256(code.encode('utf-8', 'surrogatepass')).digest()
+    compiled = _compiled.get(key)
+    if compiled is None:
+        compiled = compile(code, '<snippet>', 'exec')
+        _compiled[key] = compiled
+        if len(_compiled) > COMPILE_CACHE_ENTRIES:
+            _compiled.popitem(last=False)
+    else:
+        _compiled.move_to_end(key)
+    return compiled
+
+
+def _execute(code, stream, workdir=None, compiled=None):
+    """Run code in a fresh namespace (inside workdir if given), returning (status, error)
+
+    compiled, if given, is code already compiled. Output goes to stream, which
+    is flushed every STREAM_INTERVAL seconds so snippets that print and then
+    sleep show their output straight away.
+    """
+    namespace = {'__name__': '__main__', '__builtins__': builtins}
+    home = os.getcwd()
+    done = threading.Event()
+
+    def flush_periodically():
+        while not done.wait(STREAM_INTERVAL):
+            stream.flush()
+    flusher = threading.Thread(target=flush_periodically, daemon=True)
+    flusher.start()
+    try:
+        if workdir:
+            os.chdir(workdir)
+        with redirect_stdout(stream), redirect_stderr(stream):
+            exec(compiled or _compile(code), namespace)
+        return 'ok', ''
+    except BaseException as e:
+        return 'error', f"{type(e).__name__}: {e}"
+    finally:
+        done.set()
+        flusher.join()
+        stream.finish()
+        os.chdir(home)
+
+
+def _done(status, error='', truncated=False):
+    return {'type': 'done', 'status': status, 'error': error, 'truncated': truncated}
+
+
+def _run_isolated(conn, request, cpu_time_limit):
+    """Run one request in a forked child and relay its output to conn; return the 'done' reply
+
+    The child starts from this worker's warm state and exits after the run. It
+    gets its own pipe rather than conn and runs in its own session. Once the run
+    ends, every process still below the worker is killed and reaped (see
+    _kill_descendants), and a run with more than PROCESS_LIMIT processes alive
+    is stopped.
+    """
+    code = request['code']
+    timeout = request['timeout']
+    try:
+        compiled = _compile(code)
+    except BaseException:
+        # The child compiles it again and reports the error
+        compiled = None
+
+    reader, writer = multiprocessing.Pipe(duplex=False)
+    pid = os.fork()
+    if pid == 0:
+        try:
+            os.setsid()
+            conn.close()
+            reader.close()
+            # Other learners' snippets stay out of the child's memory
+            _compiled.clear()
+            # Backstop should the worker be killed before it can end this run
+            signal.alarm(int(timeout) + WORKER_GRACE_TIME)
+            _apply_cpu_limit(cpu_time_limit)
+            _apply_process_limit(PROCESS_LIMIT)
+            stream = _OutputStream(writer)
+            status, error = _execute(code, stream, request.get('workdir'), compiled)
+            writer.send(_done(status, error, stream.truncated))
+        finally:
+            os._exit(0)
+
+    writer.close()
+    workdir = request.get('workdir')
+    deadline = time.monotonic() + timeout
+    next_check = 0
+    try:
+        while True:
+            now = time.monotonic()
+            remaining = deadline - now
+            if remaining <= 0:
+                return _done('timeout', f"Execution timed out after {timeout} seconds")
+            # Checked on a clock rather than when the pipe is idle, so a chatty run is checked too
+            if now >= next_check:
+                next_check = now + WORKSPACE_CHECK_INTERVAL
+                # Scratch space may be tmpfs (RAM), so the total is capped, not just each file
+                if workdir and _tree_size(workdir) > WORKSPACE_LIMIT:
+                    return _done('killed', "Execution was stopped: it wrote more than "
+                                           f"{WORKSPACE_LIMIT // (1024 * 1024)} MB of files")
+                if len(_descendants(os.getpid())) > PROCESS_LIMIT:
+                    return _done('killed', "Execution was stopped: it started more than "
+                                           f"{PROCESS_LIMIT} processes")
+            if not reader.poll(min(remaining, next_check - now)):
+                continue
+            try:
+                message = reader.recv()
+            except (EOFError, OSError):
+                # The child died mid-run, normally from hitting the CPU or memory limit
+                return _done('killed', "Execution was stopped: it exceeded the CPU or memory limit")
+            if message['type'] == 'done':
+                return message
+            conn.send(message)
+    finally:
+        for kill in (os.killpg, os.kill):
+            try:
+                kill(pid, signal.SIGKILL)
+            except OSError:
+                pass
+        os.waitpid(pid, 0)
+        _kill_descendants()
+        reader.close()
+
+
+def _worker_main(conn, cpu_time_limit, memory_limit):
+    """Worker process loop: receive a snippet, run it, send back the result"""
+    _apply_memory_limit(memory_limit)
+    _apply_file_size_limit(FILE_SIZE_LIMIT)
+    _become_subreaper()
+    for module in PRELOAD_MODULES:
+        try:
+            __import__(module)
+        except ImportError:
+            pass
+
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, OSError):
+            return
+        if request is None:
+            return
+
+        if hasattr(os, 'fork'):
+            reply = _run_isolated(conn, request, cpu_time_limit)
+            reply['isolated'] = True
+        else:
+            # No fork (Windows): run here; the server replaces this worker afterwards
+            _apply_cpu_limit(cpu_time_limit)
+            stream = _OutputStream(conn)
+            status, error = _execute(request['code'], stream, request.get('workdir'))
+            reply = _done(status, error, stream.truncated)
+            reply['isolated'] = False
+        conn.send(reply)
+
+
+class _Worker:
+    def __init__(self, context, cpu_time_limit, memory_limit):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main, args=(child_conn, cpu_time_limit, memory_limit), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.kill()
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(timeout=1)
+        self.conn.close()
+
+
+class CodeRunner:
+    """Pool of warm worker processes with a bounded queue in front of it"""
+
+    def __init__(self, pool_size=POOL_SIZE, queue_limit=QUEUE_LIMIT, wall_time_limit=WALL_TIME_LIMIT,
+                 cpu_time_limit=CPU_TIME_LIMIT, memory_limit=MEMORY_LIMIT):
+        self.wall_time_limit = wall_time_limit
+        self.cpu_time_limit = cpu_time_limit
+        self.memory_limit = memory_limit
+        # spawn gives workers a clean interpreter instead of a copy of the server process
+        self._context = multiprocessing.get_context('spawn')
+        self._idle = queue.Queue()
+        self._slots = threading.BoundedSemaphore(pool_size + queue_limit)
+        self._closed = False
+        self.workspaces = WorkspacePool()
+        self.results = ResultCache()
+        self.limiter = RateLimiter()
+        self._counters = {'admitted': 0, 'throttled': 0, 'rejected': 0}
+        self._counters_lock = threading.Lock()
+        self._max_jobs = pool_size + queue_limit
+        self._jobs = {}
+        self._jobs_lock = threading.Lock()
+        self._dispatcher = ThreadPoolExecutor(max_workers=self._max_jobs, thread_name_prefix='code-runner')
+        for _ in range(pool_size):
+            self._idle.put(self._start_worker())
+
+    def _start_worker(self):
+        return _Worker(self._context, self.cpu_time_limit, self.memory_limit)
+
+    def _replace_worker(self, worker):
+        """Kill a worker and start its replacement off the request path"""
+        worker.kill()
+
+        def start():
+            if not self._closed:
+                self._idle.put(self._start_worker())
+        threading.Thread(target=start, daemon=True).start()
+
+    def _count(self, counter):
+        with self._counters_lock:
+            self._counters[counter] += 1
+
+    def admission_stats(self):
+        """Return counts of runs admitted, throttled per user and rejected as busy"""
+        with self._counters_lock:
+            return dict(self._counters)
+
+    def run(self, code, timeout=None, on_output=None, user=None):
+        """Run code in a worker and return an ExecutionResult
+
+        on_output, if given, is called with everything printed so far each
+        time more output arrives. Deterministic snippets seen before are
+        answered from the result cache without touching a worker. Otherwise
+        the run is admitted only if user (when given) is within their rate
+        limit and a slot is free; if not, this returns at once with status
+        'throttled' or 'rejected'.
+        """
+        key = None
+        if is_deterministic(code):
+            key = cache_key(code)
+            cached = self.results.get(key)
+            if cached is not None:
+                if on_output and cached.output:
+                    on_output(cached.output)
+                return replace(cached, duration=0.0, cached=True)
+        else:
+            self.results.skip()
+
+        result, isolated = self._execute(code, timeout, on_output, user)
+        # Timeouts, kills and rejections say more about load than about the code. Only
+        # runs in a freshly forked child are cached: one that shared a worker with
+        # earlier snippets may show what they changed, not what this code prints.
+        if key is not None and isolated and result.status in ('ok', 'error'):
+            self.results.put(key, result)
+        return result
+
+    def _execute(self, code, timeout, on_output, user):
+        """Run code on a worker; return (ExecutionResult, whether it ran in a fresh child)"""
+        if not self._slots.acquire(blocking=False):
+            self._count('rejected')
+            return ExecutionResult('rejected', error="The code runner is busy right now. Please try again in a moment."), False
+        # The user's token is only spent once a slot is held, so a busy rejection costs nothing
+        if user is not None:
+            retry_after = self.limiter.acquire(user)
+            if retry_after:
+                self._slots.release()
+                self._count('throttled')
+                return ExecutionResult('throttled', error=f"You are running code too quickly. Please wait {int(retry_after) + 1} seconds and try again."), False
+        self._count('admitted')
+        workdir = None
+        try:
+            worker = self._idle.get()
+            workdir = self.workspaces.acquire()
+            started = time.perf_counter()
+            limit = timeout or self.wall_time_limit
+            chunks = []
+            try:
+                worker.conn.send({'code': code, 'workdir': workdir, 'timeout': limit})
+                while True:
+                    # The worker enforces the limit itself; this only catches a stuck worker
+                    remaining = started + limit + WORKER_GRACE_TIME - time.perf_counter()
+                    if remaining <= 0 or not worker.conn.poll(remaining):
+                        self._replace_worker(worker)
+                        return ExecutionResult('timeout', ''.join(chunks), f"Execution timed out after {limit} seconds",
+                                               time.perf_counter() - started), False
+                    reply = worker.conn.recv()
+                    if reply['type'] == 'done':
+                        break
+                    chunks.append(reply['data'])
+                    if on_output:
+                        on_output(''.join(chunks))
+            except (EOFError, OSError):
+                # The worker itself died mid-run
+                self._replace_worker(worker)
+                return ExecutionResult('killed', ''.join(chunks), "Execution was stopped: it exceeded the CPU or memory limit",
+                                       time.perf_counter() - started), False
+            except BaseException:
+                # on_output failed (e.g. the page was closed) with the run still going
+                self._replace_worker(worker)
+                raise
+
+            isolated = reply.get('isolated', False)
+            if isolated:
+                self._idle.put(worker)
+            else:
+                # The snippet ran inside the worker and may have changed its state
+                self._replace_worker(worker)
+            return ExecutionResult(reply['status'], ''.join(chunks), reply['error'], time.perf_counter() - started,
+                                   truncated=reply['truncated']), isolated
+        finally:
+            if workdir is not None:
+                self.workspaces.release(workdir)
+            self._slots.release()
+
+    def submit(self, code, timeout=None, user=None):
+        """Start a run in the background and return its job id right away
+
+        Use get_job() to follow its output and pick up the result.
+        """
+        job = Job(uuid.uuid4().hex)
+        with self._jobs_lock:
+            now = time.monotonic()
+            for job_id, old in list(self._jobs.items()):
+                if old.done and now - old.finished_at > JOB_RETENTION:
+                    del self._jobs[job_id]
+            pending = sum(1 for old in self._jobs.values() if not old.done)
+            self._jobs[job.id] = job
+        if pending >= self._max_jobs:
+            self._count('rejected')
+            job._finish(ExecutionResult('rejected', error="The code runner is busy right now. Please try again in a moment."))
+            return job.id
+
+        def run():
+            def on_output(text):
+                job.output = text
+            try:
+                result = self.run(code, timeout=timeout, on_output=on_output, user=user)
+            except Exception as e:
+                result = ExecutionResult('error', job.output, f"{type(e).__name__}: {e}")
+            job._finish(result)
+        self._dispatcher.submit(run)
+        return job.id
+
+    def get_job(self, job_id):
+        """Return the Job for job_id, or None if it is unknown or has expired"""
+        with self._jobs_lock:
+            return self._jobs.get(job_id)
+
+    def shutdown(self):
+        self._closed = True
+        self._dispatcher.shutdown(wait=False, cancel_futures=True)
+        while True:
+            try:
+                self._idle.get_nowait().stop()
+            except queue.Empty:
+                break
+        self.workspaces.close()
+
+
+_runner = None
+_runner_lock = threading.Lock()
+
+
+def get_runner():
+    """Return the process-wide CodeRunner, starting its workers on first use"""
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = CodeRunner()
+        return _runner
+
+
+def run_code(code, timeout=None, on_output=None, user=None):
+    """Run a snippet in the shared worker pool, optionally streaming its output to on_output"""
+    return get_runner().run(code, timeout=timeout, on_output=on_output, user=user)
+
+
+def submit_code(code, timeout=None, user=None):
+    """Run a snippet in the background and return a job id to poll with get_job()"""
+    return get_runner().submit(code, timeout=timeout, user=user)
+
+
+def get_job(job_id):
+    """Return the background Job for job_id, or None if it is unknown or has expired"""
+    return get_runner().get_job(job_id)
+
+
+def get_admission_stats():
+    """Return admitted/throttled/rejected run counters"""
+    return get_runner().admission_stats()
+
+
+def get_result_cache_stats():
+    """Return result cache hit/miss counters"""
+    return get_runner().results.stats()
@@ -1,8 +1,6 @@
 import streamlit as st
-import json
-import os
 from datetime import datetime
-import utils
+import db_utils
 
 # Page configuration
 st.set_page_config(
@@ -11,64 +9,6 @@ st.set_page_config(
     layout="wide"
 )
 
-# Initialize discussion data
-DISCUSSIONS_FILE = "data/discussions.json"
-os.makedirs("data", exist_ok=True)
-
-# Helper functions for discussions
-def load_discussions():
-    if not os.path.exists(DISCUSSIONS_FILE):
-        with open(DISCUSSIONS_FILE, 'w') as f:
-            json.dump({"topics": []}, f)
-    try:
-        with open(DISCUSSIONS_FILE, 'r') as f:
-            return json.load(f)
-    except Exception as e:
-        st.error(f"Error loading discussions: {e}")
-        return {"topics": []}
-
-def save_discussions(discussions):
-    try:
-        with open(DISCUSSIONS_FILE, 'w') as f:
-            json.dump(discussions, f, indent=4)
-    except Exception as e:
-        st.error(f"Error saving discussions: {e}")
-
-def add_topic(title, content, author, category):
-    discussions = load_discussions()
-    topic_id = len(discussions["topics"]) + 1
-    
-    new_topic = {
-        "id": topic_id,
-        "title": title,
-        "content": content,
-        "author": author,
-        "category": category,
-        "created_at": datetime.now().isoformat(),
-        "replies": []
-    }
-    
-    discussions["topics"].append(new_topic)
-    save_discussions(discussions)
-    return topic_id
-
-def add_reply(topic_id, content, author):
-    discussions = load_discussions()
-    topic = next((t for t in discussions["topics"] if t["id"] == topic_id), None)
-    
-    if topic:
-        reply_id = len(topic["replies"]) + 1
-        new_reply = {
-            "id": reply_id,
-            "content": content,
-            "author": author,
-            "created_at": datetime.now().isoformat()
-        }
-        topic["replies"].append(new_reply)
-        save_discussions(discussions)
-        return True
-    return False
-
 # Page header
 st.title("💬 Python Learning Community")
 st.write("""
@@ -76,6 +16,16 @@ Connect with fellow Python learners, ask questions, share your projects, and dis
 This community forum is a place to enhance your learning through collaboration and knowledge sharing.
 """)
 
+def show_replies(topic):
+    """Fetch and show a topic's replies only when the reader asks for them"""
+    if not topic["reply_count"]:
+        return
+    if st.checkbox(f"Show replies ({topic['reply_count']})", key=f"show_replies_{topic['id']}"):
+        for reply in db_utils.load_replies(topic["id"]):
+            st.markdown(f"**{reply['author']}** - {datetime.fromisoformat(reply['created_at']).strftime('%Y-%m-%d %H:%M')}")
+            st.markdown(f"> {reply['content']}")
+            st.markdown("---")
+
 # Check if user is logged in
 if "username" not in st.session_state or not st.session_state.username:
     st.warning("Please log in on the home page to participate in the community.")
@@ -84,20 +34,14 @@ if "username" not in st.session_state or not st.session_state.username:
     st.header("Recent Discussions")
     st.info("You can browse discussions, but you need to log in to participate.")
     
-    discussions = load_discussions()
-    if discussions["topics"]:
-        for topic in sorted(discussions["topics"], key=lambda t: t["created_at"], reverse=True)[:5]:
+    recent_topics, _ = db_utils.list_topics(limit=5)
+    if recent_topics:
+        for topic in recent_topics:
             with st.expander(f"{topic['title']} (by {topic['author']})"):
                 st.write(f"**Category**: {topic['category']}")
                 st.write(topic['content'])
                 st.write(f"Posted on: {datetime.fromisoformat(topic['created_at']).strftime('%Y-%m-%d %H:%M')}")
-                
-                if topic["replies"]:
-                    st.write(f"**Replies ({len(topic['replies'])}):**")
-                    for reply in topic["replies"]:
-                        st.markdown(f"**{reply['author']}** - {datetime.fromisoformat(reply['created_at']).strftime('%Y-%m-%d %H:%M')}")
-                        st.markdown(f"> {reply['content']}")
-                        st.markdown("---")
+                show_replies(topic)
     else:
         st.info("No discussions yet. Be the first to start a topic!")
     
@@ -113,9 +57,6 @@ page = st.sidebar.radio(
     ["Discussion Forum", "Study Groups", "Project Showcase", "Learning Resources", "Community Guidelines"]
 )
 
-# Load discussions
-discussions = load_discussions()
-
 if page == "Discussion Forum":
     st.header("Discussion Forum")
     
@@ -131,7 +72,8 @@ if page == "Discussion Forum":
         
         if st.button("Post Topic"):
             if topic_title and topic_content:
-                add_topic(topic_title, topic_content, username, topic_category)
+                db_utils.add_topic(topic_title, topic_content, username, topic_category)
+                st.session_state.forum_cursors = [None]
                 st.success("Topic posted successfully!")
                 st.rerun()
             else:
@@ -140,17 +82,22 @@ if page == "Discussion Forum":
     # Filter topics
     st.subheader("Browse Discussions")
     
-    # Get all categories
-    all_categories = sorted(list(set([t["category"] for t in discussions["topics"]])))
+    search_query = st.text_input("Search Discussions")
+    all_categories = db_utils.list_categories()
     selected_category = st.selectbox("Filter by Category", ["All Categories"] + all_categories)
+    category = None if selected_category == "All Categories" else selected_category
     
-    # Apply filter
-    filtered_topics = discussions["topics"]
-    if selected_category != "All Categories":
-        filtered_topics = [t for t in filtered_topics if t["category"] == selected_category]
+    # One cursor per page visited, so "Newer" can step back; restart when the filter changes
+    if st.session_state.get("forum_category") != category or "forum_cursors" not in st.session_state:
+        st.session_state.forum_category = category
+        st.session_state.forum_cursors = [None]
     
-    # Sort by latest
-    filtered_topics = sorted(filtered_topics, key=lambda t: t["created_at"], reverse=True)
+    if search_query:
+        # Best matches first, including topics where only a reply matches
+        filtered_topics, next_cursor = db_utils.search_topics(search_query, category=category), None
+    else:
+        # Latest topics first, one page at a time
+        filtered_topics, next_cursor = db_utils.list_topics(category=category, before=st.session_state.forum_cursors[-1])
     
     # Display topics
     if filtered_topics:
@@ -161,22 +108,28 @@ if page == "Discussion Forum":
                 st.write(f"Posted on: {datetime.fromisoformat(topic['created_at']).strftime('%Y-%m-%d %H:%M')}")
                 
                 # Display replies
-                if topic["replies"]:
-                    st.write(f"**Replies ({len(topic['replies'])}):**")
-                    for reply in topic["replies"]:
-                        st.markdown(f"**{reply['author']}** - {datetime.fromisoformat(reply['created_at']).strftime('%Y-%m-%d %H:%M')}")
-                        st.markdown(f"> {reply['content']}")
-                        st.markdown("---")
+                show_replies(topic)
                 
                 # Reply form
                 reply_content = st.text_area("Your Reply", key=f"reply_{topic['id']}", height=100)
                 if st.button("Post Reply", key=f"reply_button_{topic['id']}"):
                     if reply_content:
-                        if add_reply(topic['id'], reply_content, username):
+                        if db_utils.add_reply(topic['id'], reply_content, username):
                             st.success("Reply posted successfully!")
                             st.rerun()
                     else:
                         st.error("Please provide a reply.")
+        
+        # Page navigation
+        col1, col2 = st.columns(2)
+        with col1:
+            if len(st.session_state.forum_cursors) > 1 and st.button("⬅️ Newer topics"):
+                st.session_state.forum_cursors.pop()
+                st.rerun()
+        with col2:
+            if next_cursor and st.button("Older topics ➡️"):
+                st.session_state.forum_cursors.append(next_cursor)
+                st.rerun()
     else:
         st.info("No topics found in this category. Be the first to create one!")
 
@@ -1,14 +1,69 @@
 import os
-from sqlalchemy import create_engine, Column, Integer, String, Text, ForeignKey, DateTime, Table
+from sqlalchemy import (create_engine, event, text, select, update, bindparam, Column, Integer, String, Text,
+                        ForeignKey, DateTime, Table, Index)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 import datetime
-import json
+import threading
+import time
+from json_stream import iter_array_items
+from progress_log import ShardedProgressLog
+from json_store import JsonStore
+
+# Pragmas applied to every new SQLite connection. WAL lets readers proceed while
+# a writer commits.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 64 * 1024 * 1024,  # bytes
+    'cache_size': -16000,           # negative means KiB, i.e. ~16 MB per connection
+}
+# Seconds a connection waits for another writer's lock instead of failing. Set
+# through the driver's timeout, which installs SQLite's busy handler on connect.
+BUSY_TIMEOUT = 5
+
+# Streamlit runs each session's script in its own thread, so keep a small pool
+# of connections that may be shared across threads
+POOL_SIZE = 5
+MAX_OVERFLOW = 10
+
+def create_db_engine(path, pragmas=None, pool_size=POOL_SIZE, max_overflow=MAX_OVERFLOW,
+                     busy_timeout=BUSY_TIMEOUT, **kwargs):
+    """Create a SQLite engine with the connection pragmas and pool settings above
+
+    pragmas overrides individual entries of SQLITE_PRAGMAS; set a value to None
+    to skip that pragma. Extra keyword arguments are passed to create_engine.
+    Pooled connections are not pinged on checkout: a local SQLite file has no
+    server to drop them.
+    """
+    settings = dict(SQLITE_PRAGMAS)
+    settings.update(pragmas or {})
+    
+    db_engine = create_engine(
+        f'sqlite:///{path}',
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        connect_args={'check_same_thread': False, 'timeout': busy_timeout},
+        **kwargs
+    )
+    
+    @event.listens_for(db_engine, 'connect')
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in settings.items():
+                if value is not None:
+                    cursor.execute(f'PRAGMA {name}={value}')
+        finally:
+            cursor.close()
+    
+    return db_engine
 
 # Create engine and base
 db_path = os.path.join('data', 'python_learning.db')
 os.makedirs('data', exist_ok=True)
-engine = create_engine(f'sqlite:///{db_path}')
+engine = create_db_engine(db_path)
 Base = declarative_base()
 Session = sessionmaker(bind=engine)
 
@@ -17,14 +72,17 @@ resource_tag_association = Table(
     'resource_tag_association', 
     Base.metadata,
     Column('resource_id', String, ForeignKey('resources.id')),
-    Column('tag_id', Integer, ForeignKey('tags.id'))
+    Column('tag_id', Integer, ForeignKey('tags.id')),
+    # Looked up per resource by the full-text search triggers
+    Index('ix_resource_tag_association_resource_id', 'resource_id')
 )
 
 project_skill_association = Table(
     'project_skill_association',
     Base.metadata,
     Column('project_id', String, ForeignKey('projects.id')),
-    Column('skill_id', Integer, ForeignKey('skills.id'))
+    Column('skill_id', Integer, ForeignKey('skills.id')),
+    Index('ix_project_skill_association_project_id', 'project_id')
 )
 
 # Define models
@@ -37,6 +95,7 @@ class User(Base):
     
     # Relationships
     completed_resources = relationship("CompletedResource", back_populates="user")
+    completed_problems = relationship("CompletedProblem", back_populates="user")
     
     def __repr__(self):
         return f"<User(username='{self.username}', level='{self.current_level}')>"
@@ -47,6 +106,10 @@ class User(Base):
 
 class CompletedResource(Base):
     __tablename__ = 'completed_resources'
+    __table_args__ = (
+        # One row per (user, resource); lets progress saves use INSERT ... ON CONFLICT DO NOTHING
+        Index('uq_completed_resources_user_resource', 'user_username', 'resource_id', unique=True),
+    )
     
     id = Column(Integer, primary_key=True)
     user_username = Column(String, ForeignKey('users.username'))
@@ -60,6 +123,25 @@ class CompletedResource(Base):
     def __repr__(self):
         return f"<CompletedResource(user='{self.user_username}', resource='{self.resource_id}')>"
 
+class CompletedProblem(Base):
+    __tablename__ = 'completed_problems'
+    __table_args__ = (
+        # One row per (user, problem), so marking a problem is a single INSERT ... ON CONFLICT DO NOTHING
+        Index('uq_completed_problems_user_problem', 'user_username', 'problem_id', unique=True),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    user_username = Column(String, ForeignKey('users.username'))
+    # Practice problems live in the read-only JSON catalog, so this is not a foreign key
+    problem_id = Column(String)
+    completed_at = Column(DateTime, default=datetime.datetime.now)
+    
+    # Relationships
+    user = relationship("User", back_populates="completed_problems")
+    
+    def __repr__(self):
+        return f"<CompletedProblem(user='{self.user_username}', problem='{self.problem_id}')>"
+
 class Tag(Base):
     __tablename__ = 'tags'
     
@@ -86,7 +168,7 @@ class Resource(Base):
     type = Column(String)
     description = Column(Text)
     url = Column(String)
-    level = Column(String)
+    level = Column(String, index=True)
     
     # Relationships
     tags = relationship("Tag", secondary=resource_tag_association)
@@ -94,7 +176,10 @@ class Resource(Base):
     def __repr__(self):
         return f"<Resource(id='{self.id}', title='{self.title}')>"
     
-    def to_dict(self):
+    def to_dict(self, tags=None):
+        # Callers that bulk-load tags pass them in to avoid a lazy load per resource
+        if tags is None:
+            tags = [tag.name for tag in self.tags]
         return {
             'id': self.id,
             'title': self.title,
@@ -102,7 +187,7 @@ class Resource(Base):
             'description': self.description,
             'url': self.url,
             'level': self.level,
-            'tags': [tag.name for tag in self.tags]
+            'tags': tags
         }
 
 class Project(Base):
@@ -122,7 +207,10 @@ class Project(Base):
     def __repr__(self):
         return f"<Project(id='{self.id}', title='{self.title}')>"
     
-    def to_dict(self):
+    def to_dict(self, skills=None):
+        # Callers that bulk-load skills pass them in to avoid a lazy load per project
+        if skills is None:
+            skills = [skill.name for skill in self.skills]
         return {
             'id': self.id,
             'title': self.title,
@@ -131,11 +219,16 @@ class Project(Base):
             'difficulty': self.difficulty,
             'details': self.details,
             'starter_code': self.starter_code,
-            'skills': [skill.name for skill in self.skills]
+            'skills': skills
         }
 
 class Discussion(Base):
     __tablename__ = 'discussions'
+    __table_args__ = (
+        # Forum listing: newest first, optionally within one category
+        Index('ix_discussions_category_created_at', 'category', 'created_at'),
+        Index('ix_discussions_created_at', 'created_at'),
+    )
     
     id = Column(Integer, primary_key=True)
     title = Column(String, nullable=False)
@@ -163,6 +256,10 @@ class Discussion(Base):
 
 class Reply(Base):
     __tablename__ = 'replies'
+    __table_args__ = (
+        # Replies of one thread in posting order
+        Index('ix_replies_discussion_created_at', 'discussion_id', 'created_at'),
+    )
     
     id = Column(Integer, primary_key=True)
     discussion_id = Column(Integer, ForeignKey('discussions.id'))
@@ -184,153 +281,408 @@ class Reply(Base):
             'created_at': self.created_at.isoformat()
         }
 
+class CatalogVersion(Base):
+    __tablename__ = 'catalog_version'
+    
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<CatalogVersion(version={self.version})>"
+
+def get_catalog_version(session):
+    """Return the current catalog generation number (0 if never written)"""
+    row = session.query(CatalogVersion).filter_by(id=1).first()
+    return row.version if row else 0
+
+def bump_catalog_version(session):
+    """Advance the catalog generation so cached copies of resources/projects are rebuilt"""
+    row = session.query(CatalogVersion).filter_by(id=1).first()
+    if not row:
+        row = CatalogVersion(id=1, version=0)
+        session.add(row)
+    row.version += 1
+    return row.version
+
 # Initialize the database
 def init_db():
     Base.metadata.create_all(engine)
+    upgrade_db()
+    migrate_practice_completions()
+    migrate_legacy_discussions()
+
+_db_ready = False
+_db_ready_lock = threading.Lock()
+
+def ensure_db():
+    """Run init_db() once per process, so calling this on every Streamlit rerun costs nothing"""
+    global _db_ready
+    if _db_ready:
+        return
+    with _db_ready_lock:
+        if not _db_ready:
+            init_db()
+            _db_ready = True
+
+def upgrade_db():
+    """Bring databases created by older versions up to date with the models
+
+    create_all() only creates missing tables, so indexes declared on tables that
+    already exist, and the full-text search tables, are created here.
+    """
+    with engine.begin() as conn:
+        # Older databases may hold duplicate completions, which would block the unique index
+        has_unique_index = conn.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'uq_completed_resources_user_resource'"
+        )).first()
+        if not has_unique_index:
+            conn.execute(text(
+                "DELETE FROM completed_resources WHERE id NOT IN ("
+                "SELECT MIN(id) FROM completed_resources GROUP BY user_username, resource_id)"
+            ))
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+        init_search_index(conn)
+
+# Full-text search: one FTS5 table per searchable model, keyed by the source row's
+# rowid and kept in sync by triggers. Each entry is (table, create, backfill, triggers).
+# Search is prefix-as-you-type ("decorat" finds "decorators"), so words are indexed
+# unstemmed: a stemmer would store "decor" and no typed prefix past it would match.
+_TAG_NAMES = ("(SELECT group_concat(t.name, ' ') FROM tags t JOIN resource_tag_association a "
+              "ON a.tag_id = t.id WHERE a.resource_id = {id})")
+_SKILL_NAMES = ("(SELECT group_concat(s.name, ' ') FROM skills s JOIN project_skill_association a "
+                "ON a.skill_id = s.id WHERE a.project_id = {id})")
+
+SEARCH_INDEXES = [
+    ('resources_fts',
+     "CREATE VIRTUAL TABLE resources_fts USING fts5("
+     "resource_id UNINDEXED, title, description, type, tags, tokenize='unicode61', prefix='2 3')",
+     "INSERT INTO resources_fts(rowid, resource_id, title, description, type, tags) "
+     "SELECT rowid, id, title, description, type, " + _TAG_NAMES.format(id='resources.id') + " FROM resources",
+     [
+         "CREATE TRIGGER IF NOT EXISTS resources_fts_insert AFTER INSERT ON resources BEGIN "
+         "INSERT INTO resources_fts(rowid, resource_id, title, description, type, tags) "
+         "VALUES (new.rowid, new.id, new.title, new.description, new.type, NULL); END",
+         "CREATE TRIGGER IF NOT EXISTS resources_fts_update AFTER UPDATE ON resources BEGIN "
+         "UPDATE resources_fts SET resource_id = new.id, title = new.title, description = new.description, "
+         "type = new.type WHERE rowid = old.rowid; END",
+         "CREATE TRIGGER IF NOT EXISTS resources_fts_delete AFTER DELETE ON resources BEGIN "
+         "DELETE FROM resources_fts WHERE rowid = old.rowid; END",
+         "CREATE TRIGGER IF NOT EXISTS resources_fts_tag_insert AFTER INSERT ON resource_tag_association BEGIN "
+         "UPDATE resources_fts SET tags = " + _TAG_NAMES.format(id='new.resource_id') + " "
+         "WHERE rowid = (SELECT rowid FROM resources WHERE id = new.resource_id); END",
+         "CREATE TRIGGER IF NOT EXISTS resources_fts_tag_delete AFTER DELETE ON resource_tag_association BEGIN "
+         "UPDATE resources_fts SET tags = " + _TAG_NAMES.format(id='old.resource_id') + " "
+         "WHERE rowid = (SELECT rowid FROM resources WHERE id = old.resource_id); END",
+     ]),
+    ('projects_fts',
+     "CREATE VIRTUAL TABLE projects_fts USING fts5("
+     "project_id UNINDEXED, title, description, details, skills, tokenize='unicode61', prefix='2 3')",
+     "INSERT INTO projects_fts(rowid, project_id, title, description, details, skills) "
+     "SELECT rowid, id, title, description, details, " + _SKILL_NAMES.format(id='projects.id') + " FROM projects",
+     [
+         "CREATE TRIGGER IF NOT EXISTS projects_fts_insert AFTER INSERT ON projects BEGIN "
+         "INSERT INTO projects_fts(rowid, project_id, title, description, details, skills) "
+         "VALUES (new.rowid, new.id, new.title, new.description, new.details, NULL); END",
+         "CREATE TRIGGER IF NOT EXISTS projects_fts_update AFTER UPDATE ON projects BEGIN "
+         "UPDATE projects_fts SET project_id = new.id, title = new.title, description = new.description, "
+         "details = new.details WHERE rowid = old.rowid; END",
+         "CREATE TRIGGER IF NOT EXISTS projects_fts_delete AFTER DELETE ON projects BEGIN "
+         "DELETE FROM projects_fts WHERE rowid = old.rowid; END",
+         "CREATE TRIGGER IF NOT EXISTS projects_fts_skill_insert AFTER INSERT ON project_skill_association BEGIN "
+         "UPDATE projects_fts SET skills = " + _SKILL_NAMES.format(id='new.project_id') + " "
+         "WHERE rowid = (SELECT rowid FROM projects WHERE id = new.project_id); END",
+         "CREATE TRIGGER IF NOT EXISTS projects_fts_skill_delete AFTER DELETE ON project_skill_association BEGIN "
+         "UPDATE projects_fts SET skills = " + _SKILL_NAMES.format(id='old.project_id') + " "
+         "WHERE rowid = (SELECT rowid FROM projects WHERE id = old.project_id); END",
+     ]),
+    ('discussions_fts',
+     "CREATE VIRTUAL TABLE discussions_fts USING fts5("
+     "title, content, category UNINDEXED, tokenize='unicode61', prefix='2 3')",
+     "INSERT INTO discussions_fts(rowid, title, content, category) SELECT id, title, content, category FROM discussions",
+     [
+         "CREATE TRIGGER IF NOT EXISTS discussions_fts_insert AFTER INSERT ON discussions BEGIN "
+         "INSERT INTO discussions_fts(rowid, title, content, category) "
+         "VALUES (new.id, new.title, new.content, new.category); END",
+         "CREATE TRIGGER IF NOT EXISTS discussions_fts_update AFTER UPDATE ON discussions BEGIN "
+         "DELETE FROM discussions_fts WHERE rowid = old.id; "
+         "INSERT INTO discussions_fts(rowid, title, content, category) "
+         "VALUES (new.id, new.title, new.content, new.category); END",
+         "CREATE TRIGGER IF NOT EXISTS discussions_fts_delete AFTER DELETE ON discussions BEGIN "
+         "DELETE FROM discussions_fts WHERE rowid = old.id; END",
+     ]),
+    ('replies_fts',
+     "CREATE VIRTUAL TABLE replies_fts USING fts5("
+     "discussion_id UNINDEXED, content, tokenize='unicode61', prefix='2 3')",
+     "INSERT INTO replies_fts(rowid, discussion_id, content) SELECT id, discussion_id, content FROM replies",
+     [
+         "CREATE TRIGGER IF NOT EXISTS replies_fts_insert AFTER INSERT ON replies BEGIN "
+         "INSERT INTO replies_fts(rowid, discussion_id, content) VALUES (new.id, new.discussion_id, new.content); END",
+         "CREATE TRIGGER IF NOT EXISTS replies_fts_update AFTER UPDATE ON replies BEGIN "
+         "UPDATE replies_fts SET discussion_id = new.discussion_id, content = new.content "
+         "WHERE rowid = old.id; END",
+         "CREATE TRIGGER IF NOT EXISTS replies_fts_delete AFTER DELETE ON replies BEGIN "
+         "DELETE FROM replies_fts WHERE rowid = old.id; END",
+     ]),
+]
+
+def init_search_index(conn):
+    """Create the FTS5 tables and sync triggers, filling any table that is new
+
+    A table created with a different definition (e.g. an older tokenizer) is
+    dropped and rebuilt.
+    """
+    existing = dict(conn.execute(text("SELECT name, sql FROM sqlite_master WHERE type = 'table'")).all())
+    for table, create, backfill, triggers in SEARCH_INDEXES:
+        if table in existing and existing[table] != create:
+            conn.execute(text(f"DROP TABLE {table}"))
+            del existing[table]
+        if table not in existing:
+            conn.execute(text(create))
+            conn.execute(text(backfill))
+        for trigger in triggers:
+            conn.execute(text(trigger))
+
+def rebuild_search_index():
+    """Drop and refill every full-text table from the source tables"""
+    with engine.begin() as conn:
+        for table, _, _, _ in SEARCH_INDEXES:
+            conn.execute(text(f"DROP TABLE IF EXISTS {table}"))
+        init_search_index(conn)
 
 # Migration: Move data from JSON files to SQLite
-def migrate_from_json():
+MIGRATION_BATCH_SIZE = 5000
+
+def _batches(items, size):
+    """Yield lists of at most size items from any iterable"""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def _insert_names(conn, table, names, known):
+    """Insert missing tag/skill names and record their ids in known (name -> id)"""
+    missing = sorted(set(names) - set(known))
+    if missing:
+        conn.execute(sqlite_insert(table).on_conflict_do_nothing(index_elements=['name']),
+                     [{'name': name} for name in missing])
+        rows = conn.execute(select(table.c.id, table.c.name).where(table.c.name.in_(missing)))
+        known.update((name, id_) for id_, name in rows)
+
+def _migrate_catalog(conn, items, model, association, link_column, name_model, name_key, known_ids, known_names, row_for):
+    """Insert catalog items (resources or projects) not already present, with their tag/skill links"""
+    new_items = [item for item in items if item['id'] not in known_ids]
+    if not new_items:
+        return 0
+    
+    _insert_names(conn, name_model.__table__, [n for item in new_items for n in item.get(name_key, [])], known_names)
+    conn.execute(model.__table__.insert(), [row_for(item) for item in new_items])
+    
+    name_column = [c.name for c in association.c if c.name != link_column][0]
+    links = [{link_column: item['id'], name_column: known_names[n]}
+             for item in new_items for n in dict.fromkeys(item.get(name_key, []))]
+    if links:
+        conn.execute(association.insert(), links)
+    
+    known_ids.update(item['id'] for item in new_items)
+    return len(new_items) + len(links)
+
+def _ensure_users(conn, usernames):
+    """Insert users that do not exist yet"""
+    result = conn.execute(sqlite_insert(User.__table__).on_conflict_do_nothing(index_elements=['username']),
+                          [{'username': u} for u in dict.fromkeys(usernames)])
+    return max(result.rowcount, 0)
+
+def migrate_practice_completions(path=os.path.join('data', 'practice_problems.json')):
+    """Move completed practice problems out of the practice problem catalog into completed_problems
+
+    Older versions kept them in the catalog file under "completed_problems". They
+    are copied into the database and then dropped from the file, in one pass under
+    the file's lock, so this is a no-op once done and the catalog stays read-only.
+    """
+    if not os.path.exists(path):
+        return 0
+    
+    store = JsonStore(path)
+    with store.lock():
+        problems = store.read()
+        completed = problems.get('completed_problems') if isinstance(problems, dict) else None
+        if completed is None:
+            return 0
+        
+        rows = [{'user_username': username, 'problem_id': problem_id}
+                for username, problem_ids in completed.items()
+                for problem_id in dict.fromkeys(problem_ids)]
+        if rows:
+            with engine.begin() as conn:
+                _ensure_users(conn, list(completed))
+                conn.execute(
+                    sqlite_insert(CompletedProblem.__table__).on_conflict_do_nothing(
+                        index_elements=['user_username', 'problem_id']),
+                    rows)
+        # Only rewrite the catalog once the completions are committed
+        del problems['completed_problems']
+        store.write(problems)
+    return len(rows)
+
+def _topic_ids(conn, keys):
+    """Map (author, created_at, title) keys to the ids of matching discussions"""
+    rows = conn.execute(select(Discussion.id, Discussion.author, Discussion.created_at, Discussion.title).where(
+        Discussion.created_at.in_(set(created_at for _, created_at, _ in keys))))
+    return {(author, created_at, title): id_ for id_, author, created_at, title in rows
+            if (author, created_at, title) in keys}
+
+def migrate_legacy_discussions(path=os.path.join('data', 'discussions.json'), batch_size=MIGRATION_BATCH_SIZE):
+    """Import topics and replies from the {"topics": [...]} file older versions of the forum wrote
+
+    The file's own ids (len(topics) + 1, which concurrent posts could repeat) may
+    already belong to other topics, so the database assigns new ones. Topics are
+    matched on (author, created_at, title) and replies on (topic, author,
+    created_at), so running this again only adds what is missing. Returns the
+    number of rows written.
+    """
+    if not os.path.exists(path):
+        return 0
+    with open(path, 'r') as f:
+        if not f.read(64).lstrip().startswith('{'):
+            # Not the forum's format (the cloud app keeps a plain list of its own)
+            return 0
+    
+    rows_written = 0
+    with JsonStore(path).lock():
+        for batch in _batches(iter_array_items(path, 'topics'), batch_size):
+            # Duplicates within the file collapse into one topic with all their replies
+            topics = {}
+            for topic in batch:
+                key = (topic['author'], datetime.datetime.fromisoformat(topic['created_at']), topic['title'])
+                topics.setdefault(key, (topic, []))[1].extend(topic.get('replies', []))
+            
+            with engine.begin() as conn:
+                ids = _topic_ids(conn, topics)
+                new_keys = [key for key in topics if key not in ids]
+                authors = [key[0] for key in new_keys]
+                authors += [r['author'] for _, replies in topics.values() for r in replies]
+                if authors:
+                    rows_written += _ensure_users(conn, authors)
+                if new_keys:
+                    conn.execute(Discussion.__table__.insert(), [{
+                        'title': title,
+                        'content': topics[(author, created_at, title)][0]['content'],
+                        'author': author,
+                        'category': topics[(author, created_at, title)][0]['category'],
+                        'created_at': created_at
+                    } for author, created_at, title in new_keys])
+                    rows_written += len(new_keys)
+                    ids = _topic_ids(conn, topics)
+                
+                existing_replies = set(conn.execute(
+                    select(Reply.discussion_id, Reply.author, Reply.created_at).where(
+                        Reply.discussion_id.in_(set(ids.values())))).all())
+                new_replies = {}
+                for key, (_, replies) in topics.items():
+                    for reply in replies:
+                        reply_key = (ids[key], reply['author'], datetime.datetime.fromisoformat(reply['created_at']))
+                        if reply_key not in existing_replies:
+                            new_replies.setdefault(reply_key, reply['content'])
+                if new_replies:
+                    conn.execute(Reply.__table__.insert(), [{
+                        'discussion_id': topic_id,
+                        'content': content,
+                        'author': author,
+                        'created_at': created_at
+                    } for (topic_id, author, created_at), content in new_replies.items()])
+                    rows_written += len(new_replies)
+    return rows_written
+
+def migrate_from_json(batch_size=MIGRATION_BATCH_SIZE):
+    """Copy resources, projects and user progress from the JSON files into SQLite
+
+    Discussions are imported by init_db(), as they are on every startup.
+    Rows are written with executemany in batches of batch_size, each batch in
+    its own transaction. User progress is streamed from disk
+    and deduplicated by the database per batch, so memory use stays bounded by
+    the batch size rather than the size of the export.
+    Running the migration again (e.g. after an interruption) only inserts what
+    is still missing.
+    """
     from utils import load_resources, load_projects
     
-    session = Session()
+    started = time.perf_counter()
+    rows_written = 0
     
-    # Migrate resources
     try:
-        resources = load_resources()
-        for resource in resources:
-            # First check if resource already exists
-            existing = session.query(Resource).filter_by(id=resource['id']).first()
-            if existing:
-                continue
-                
-            db_resource = Resource(
-                id=resource['id'],
-                title=resource['title'],
-                type=resource['type'],
-                description=resource['description'],
-                url=resource['url'],
-                level=resource['level']
-            )
-            
-            # Add tags
-            for tag_name in resource.get('tags', []):
-                # Get or create tag
-                tag = session.query(Tag).filter_by(name=tag_name).first()
-                if not tag:
-                    tag = Tag(name=tag_name)
-                    session.add(tag)
-                db_resource.tags.append(tag)
-            
-            session.add(db_resource)
+        # Preload the (small) catalog keys so each row is checked against a set, not a query
+        with engine.connect() as conn:
+            resource_ids = set(conn.execute(select(Resource.id)).scalars())
+            project_ids = set(conn.execute(select(Project.id)).scalars())
+            tag_ids = {name: id_ for id_, name in conn.execute(select(Tag.id, Tag.name))}
+            skill_ids = {name: id_ for id_, name in conn.execute(select(Skill.id, Skill.name))}
         
-        # Migrate projects
-        projects = load_projects()
-        for project in projects:
-            # First check if project already exists
-            existing = session.query(Project).filter_by(id=project['id']).first()
-            if existing:
-                continue
-                
-            db_project = Project(
-                id=project['id'],
-                title=project['title'],
-                description=project['description'],
-                level=project['level'],
-                difficulty=project['difficulty'],
-                details=project['details'],
-                starter_code=project.get('starter_code', '')
-            )
-            
-            # Add skills
-            for skill_name in project.get('skills', []):
-                # Get or create skill
-                skill = session.query(Skill).filter_by(name=skill_name).first()
-                if not skill:
-                    skill = Skill(name=skill_name)
-                    session.add(skill)
-                db_project.skills.append(skill)
-            
-            session.add(db_project)
+        # Migrate resources and projects in one transaction so the catalog version moves once
+        with engine.begin() as conn:
+            catalog_rows = _migrate_catalog(
+                conn, load_resources(), Resource, resource_tag_association, 'resource_id',
+                Tag, 'tags', resource_ids, tag_ids,
+                lambda r: {'id': r['id'], 'title': r['title'], 'type': r['type'],
+                           'description': r['description'], 'url': r['url'], 'level': r['level']})
+            catalog_rows += _migrate_catalog(
+                conn, load_projects(), Project, project_skill_association, 'project_id',
+                Skill, 'skills', project_ids, skill_ids,
+                lambda p: {'id': p['id'], 'title': p['title'], 'description': p['description'],
+                           'level': p['level'], 'difficulty': p['difficulty'], 'details': p['details'],
+                           'starter_code': p.get('starter_code', '')})
+            if catalog_rows:
+                session = Session(bind=conn)
+                bump_catalog_version(session)
+                session.flush()
+                session.close()
+        rows_written += catalog_rows
         
-        # Migrate user progress
-        user_progress_file = os.path.join('data', 'user_progress.json')
-        if os.path.exists(user_progress_file):
-            with open(user_progress_file, 'r') as f:
-                user_progress = json.load(f)
-                
-            for username, data in user_progress.items():
-                # Create or update user
-                user = session.query(User).filter_by(username=username).first()
-                if not user:
-                    user = User(username=username)
-                
-                user.current_level = data.get('current_level', 'beginner')
-                
-                # Add completed resources
-                for resource_id in data.get('completed_resources', []):
-                    # Check if this completion already exists
-                    existing = session.query(CompletedResource).filter_by(
-                        user_username=username, 
-                        resource_id=resource_id
-                    ).first()
-                    
-                    if not existing:
-                        completed = CompletedResource(
-                            user_username=username,
-                            resource_id=resource_id
-                        )
-                        session.add(completed)
-                
-                session.add(user)
+        if catalog_rows:
+            from catalog_cache import catalog_cache
+            catalog_cache.invalidate()
         
-        # Migrate discussions
-        discussions_file = os.path.join('data', 'discussions.json')
-        if os.path.exists(discussions_file):
-            with open(discussions_file, 'r') as f:
-                discussions_data = json.load(f)
-                
-            for topic in discussions_data.get('topics', []):
-                # Check if this user exists, create if not
-                user = session.query(User).filter_by(username=topic['author']).first()
-                if not user:
-                    user = User(username=topic['author'])
-                    session.add(user)
-                
-                # Create discussion
-                discussion = Discussion(
-                    id=topic['id'],
-                    title=topic['title'],
-                    content=topic['content'],
-                    author=topic['author'],
-                    category=topic['category'],
-                    created_at=datetime.datetime.fromisoformat(topic['created_at'])
-                )
-                
-                # Add replies
-                for reply_data in topic.get('replies', []):
-                    # Check if this user exists, create if not
-                    reply_user = session.query(User).filter_by(username=reply_data['author']).first()
-                    if not reply_user:
-                        reply_user = User(username=reply_data['author'])
-                        session.add(reply_user)
-                    
-                    reply = Reply(
-                        content=reply_data['content'],
-                        author=reply_data['author'],
-                        created_at=datetime.datetime.fromisoformat(reply_data['created_at'])
-                    )
-                    discussion.replies.append(reply)
+        # Migrate user progress: per-user shards, plus users still only in the legacy single file
+        user_progress = ShardedProgressLog(os.path.join('data', 'progress'),
+                                           legacy_path=os.path.join('data', 'user_progress.json')).iter_users()
+        
+        level_update = update(User.__table__).where(
+            User.__table__.c.username == bindparam('b_username')
+        ).values(current_level=bindparam('b_level'))
+        
+        for batch in _batches(user_progress, batch_size):
+            with engine.begin() as conn:
+                rows_written += _ensure_users(conn, [username for username, _ in batch])
+                conn.execute(level_update, [
+                    {'b_username': username, 'b_level': data.get('current_level', 'beginner')}
+                    for username, data in batch
+                ])
                 
-                session.add(discussion)
+                # Completions already present are skipped by the unique (user, resource) index
+                new_completions = [{'user_username': username, 'resource_id': resource_id}
+                                   for username, data in batch
+                                   for resource_id in dict.fromkeys(data.get('completed_resources', []))]
+                if new_completions:
+                    result = conn.execute(
+                        sqlite_insert(CompletedResource.__table__).on_conflict_do_nothing(
+                            index_elements=['user_username', 'resource_id']),
+                        new_completions)
+                    rows_written += max(result.rowcount, 0)
+    
+        # Discussions are imported by init_db (migrate_legacy_discussions)
         
-        session.commit()
-        print("Data migration completed successfully!")
+        elapsed = time.perf_counter() - started
+        rate = rows_written / elapsed if elapsed > 0 else 0
+        print(f"Data migration completed successfully! {rows_written} rows in {elapsed:.1f}s ({rate:.0f} rows/sec)")
         
     except Exception as e:
-        session.rollback()
         print(f"Error during migration: {e}")
-    finally:
-        session.close()
+        print(f"{rows_written} rows were committed before the error; run the migration again to resume.")
 
 # Initialize database and migrate data
 if __name__ == '__main__':
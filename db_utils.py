@@ -1,28 +1,71 @@
-from database import Session, User, Resource, Tag, Project, Skill, CompletedResource, Discussion, Reply
-import streamlit as st
+from database import (Session, User, Resource, Tag, Project, Skill, CompletedResource, CompletedProblem, Discussion, Reply,
+                      resource_tag_association, project_skill_association, get_catalog_version)
+from catalog_cache import catalog_cache
+from sqlalchemy import func, case, select, text, tuple_, literal_column
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from collections import defaultdict
 import datetime
 import random
+import re
+import database
+
+# Every page reaches the database through this module, so this is the one place
+# that brings it up to date (new tables, indexes and one-off migrations) whichever
+# script Streamlit was started with. Only the first import in a process does any work.
+database.ensure_db()
+
+def _catalog_version():
+    session = Session()
+    try:
+        return get_catalog_version(session)
+    finally:
+        session.close()
 
 def load_resources():
-    """Load resources from database"""
+    """Load resources from database (served from the shared catalog cache)"""
+    return catalog_cache.get('db_resources', _catalog_version, _query_resources)
+
+def load_projects():
+    """Load projects from database (served from the shared catalog cache)"""
+    return catalog_cache.get('db_projects', _catalog_version, _query_projects)
+
+def get_catalog_cache_stats():
+    """Return catalog cache hit/miss counters"""
+    return catalog_cache.stats()
+
+def _query_resources():
     session = Session()
     try:
+        # Fetch every (resource, tag) pair in one query instead of one lazy load per resource
+        tags_by_resource = defaultdict(list)
+        tag_rows = session.query(resource_tag_association.c.resource_id, Tag.name).join(
+            Tag, Tag.id == resource_tag_association.c.tag_id)
+        for resource_id, tag_name in tag_rows:
+            tags_by_resource[resource_id].append(tag_name)
+        
         resources = session.query(Resource).all()
-        return [resource.to_dict() for resource in resources]
+        return [resource.to_dict(tags=tags_by_resource.get(resource.id, [])) for resource in resources]
     finally:
         session.close()
 
-def load_projects():
-    """Load projects from database"""
+def _query_projects():
     session = Session()
     try:
+        # Fetch every (project, skill) pair in one query instead of one lazy load per project
+        skills_by_project = defaultdict(list)
+        skill_rows = session.query(project_skill_association.c.project_id, Skill.name).join(
+            Skill, Skill.id == project_skill_association.c.skill_id)
+        for project_id, skill_name in skill_rows:
+            skills_by_project[project_id].append(skill_name)
+        
         projects = session.query(Project).all()
-        return [project.to_dict() for project in projects]
+        return [project.to_dict(skills=skills_by_project.get(project.id, [])) for project in projects]
     finally:
         session.close()
 
 def load_user_progress(username):
     """Load user progress from database"""
+    import streamlit as st
     session = Session()
     try:
         # Get or create user
@@ -61,73 +104,153 @@ def save_user_progress(username, completed_resources, current_level):
         user.current_level = current_level
         user.update_last_active()
         
-        # Get existing completed resources
-        existing_completed = set(cr.resource_id for cr in 
-                              session.query(CompletedResource).filter_by(user_username=username).all())
-        
-        # Add new completed resources
-        for resource_id in completed_resources:
-            if resource_id not in existing_completed:
-                completed = CompletedResource(
-                    user_username=username,
-                    resource_id=resource_id,
-                    completed_at=datetime.datetime.now()
-                )
-                session.add(completed)
-        
-        # Remove completed resources that are no longer in the list
-        for resource_id in existing_completed:
-            if resource_id not in completed_resources:
-                to_delete = session.query(CompletedResource).filter_by(
-                    user_username=username, 
-                    resource_id=resource_id
-                ).first()
-                if to_delete:
-                    session.delete(to_delete)
+        # Diff the requested set against what is stored, then apply it in two statements
+        existing_completed = set(resource_id for (resource_id,) in 
+                              session.query(CompletedResource.resource_id).filter_by(user_username=username))
+        wanted = set(completed_resources)
+        to_add = wanted - existing_completed
+        to_remove = existing_completed - wanted
+        
+        if to_add:
+            now = datetime.datetime.now()
+            session.execute(
+                sqlite_insert(CompletedResource).on_conflict_do_nothing(
+                    index_elements=['user_username', 'resource_id']),
+                [{'user_username': username, 'resource_id': resource_id, 'completed_at': now}
+                 for resource_id in to_add]
+            )
+        
+        if to_remove:
+            session.query(CompletedResource).filter(
+                CompletedResource.user_username == username,
+                CompletedResource.resource_id.in_(to_remove)
+            ).delete(synchronize_session=False)
         
         session.commit()
     finally:
         session.close()
 
-def get_recommendations(level, completed_resources):
-    """Get personalized recommendations based on user's progress"""
+def get_completed_problems(username):
+    """Return the set of practice problem ids the user has completed"""
     session = Session()
     try:
-        # Get all resources for the current level that haven't been completed
-        resources = session.query(Resource).filter(
-            Resource.level == level,
-            ~Resource.id.in_(completed_resources)
-        ).all()
-        
-        # Convert to dictionary format
-        available_resources = [resource.to_dict() for resource in resources]
+        return set(problem_id for (problem_id,) in
+                   session.query(CompletedProblem.problem_id).filter_by(user_username=username))
+    finally:
+        session.close()
+
+def mark_problem_completed(username, problem_id):
+    """Record a completed practice problem (a single-row insert; repeats are ignored)"""
+    session = Session()
+    try:
+        session.execute(sqlite_insert(User).on_conflict_do_nothing(index_elements=['username']),
+                        [{'username': username}])
+        session.execute(
+            sqlite_insert(CompletedProblem).on_conflict_do_nothing(
+                index_elements=['user_username', 'problem_id']),
+            [{'user_username': username, 'problem_id': problem_id, 'completed_at': datetime.datetime.now()}]
+        )
+        session.commit()
+    finally:
+        session.close()
+
+def mark_problem_incomplete(username, problem_id):
+    """Remove a practice problem from the user's completed problems"""
+    session = Session()
+    try:
+        session.query(CompletedProblem).filter_by(user_username=username, problem_id=problem_id).delete(
+            synchronize_session=False)
+        session.commit()
+    finally:
+        session.close()
+
+def _recommendation_record(row):
+    """Lightweight dict with just the fields recommendation cards display"""
+    return {
+        'id': row.id,
+        'title': row.title,
+        'type': row.type,
+        'description': row.description,
+        'url': row.url,
+        'level': row.level
+    }
+
+SAMPLE_ATTEMPTS = 16  # random rowids tried per pick before falling back to a walk
+
+def _sample_resources(session, columns, level, exclude, count):
+    """Pick up to count random resources of level whose ids are not in exclude
+
+    Each pick draws random rowids within the level's ix_resources_level range and
+    looks each up by primary key until one is an eligible resource, so every
+    eligible resource is equally likely and the cost grows with count rather than
+    with the number of resources at the level. After SAMPLE_ATTEMPTS misses (a
+    level mostly completed, or mostly other levels' rowids) it takes the first
+    eligible resource after a random rowid instead, wrapping around; those
+    fallback picks favour resources that follow excluded ones or gaps in rowids.
+    """
+    rowid = literal_column('resources.rowid')
+    low, high = session.query(
+        select(func.min(rowid)).select_from(Resource).where(Resource.level == level).scalar_subquery(),
+        select(func.max(rowid)).select_from(Resource).where(Resource.level == level).scalar_subquery()
+    ).one()
+    if low is None:
+        return []
+    
+    picked = []
+    exclude = set(exclude)
+    at_level = session.query(*columns).filter(Resource.level == level)
+    for _ in range(count):
+        row = None
+        for _ in range(SAMPLE_ATTEMPTS):
+            candidate = at_level.filter(rowid == random.randint(low, high)).first()
+            if candidate is not None and candidate.id not in exclude:
+                row = candidate
+                break
+        if row is None:
+            eligible = at_level.filter(~Resource.id.in_(list(exclude)))
+            start = random.randint(low, high)
+            row = eligible.filter(rowid >= start).order_by(rowid).limit(1).first()
+            if row is None:
+                row = eligible.order_by(rowid).limit(1).first()
+        if row is None:
+            break
+        picked.append(row)
+        exclude.add(row.id)
+    return picked
+
+def get_recommendations(level, completed_resources, limit=3):
+    """Get up to `limit` personalized recommendations based on user's progress"""
+    session = Session()
+    try:
+        completed_resources = list(completed_resources)
+        columns = (Resource.id, Resource.title, Resource.type, Resource.description, Resource.url, Resource.level)
+        recommendations = []
         
         # If user has completed more than 80% of current level, suggest some from next level
         if level != "advanced":
-            # Count completed level resources
-            completed_count = session.query(Resource).filter(
-                Resource.level == level,
-                Resource.id.in_(completed_resources)
-            ).count()
-            
-            # Count all resources at this level
-            total_count = session.query(Resource).filter(
-                Resource.level == level
-            ).count()
+            # The total is counted from ix_resources_level alone. Completed ones are found by
+            # primary key only; a level filter in WHERE would lead SQLite to scan the level instead.
+            total_count = session.query(func.count()).select_from(Resource).filter(Resource.level == level).scalar()
+            completed_count = session.query(
+                func.coalesce(func.sum(case((Resource.level == level, 1), else_=0)), 0)
+            ).filter(Resource.id.in_(completed_resources)).scalar()
             
             if total_count > 0 and completed_count / total_count >= 0.8:
                 next_level = "intermediate" if level == "beginner" else "advanced"
-                next_level_resources = session.query(Resource).filter(
+                next_level_resources = session.query(*columns).filter(
                     Resource.level == next_level,
                     ~Resource.id.in_(completed_resources)
-                ).limit(2).all()
-                
-                available_resources.extend([r.to_dict() for r in next_level_resources])
+                ).limit(min(2, limit)).all()
+                recommendations.extend(_recommendation_record(r) for r in next_level_resources)
+        
+        # Sample only as many uncompleted resources from the current level as can be shown
+        resources = _sample_resources(session, columns, level, completed_resources, limit)
+        recommendations.extend(_recommendation_record(r) for r in resources)
         
         # Randomize a bit to provide variety
-        random.shuffle(available_resources)
+        random.shuffle(recommendations)
         
-        return available_resources
+        return recommendations[:limit]
     finally:
         session.close()
 
@@ -140,17 +263,163 @@ def load_discussions():
     finally:
         session.close()
 
+TOPICS_PER_PAGE = 10
+
+def _topic_headers(session):
+    """Query for topic header rows: topic columns plus a reply count, without the replies"""
+    reply_count = select(func.count(Reply.id)).where(
+        Reply.discussion_id == Discussion.id
+    ).correlate(Discussion).scalar_subquery()
+    
+    return session.query(
+        Discussion.id, Discussion.title, Discussion.content, Discussion.author,
+        Discussion.category, Discussion.created_at, reply_count.label('reply_count')
+    )
+
+def _topic_header_dict(row):
+    return {
+        'id': row.id,
+        'title': row.title,
+        'content': row.content,
+        'author': row.author,
+        'category': row.category,
+        'created_at': row.created_at.isoformat(),
+        'reply_count': row.reply_count
+    }
+
+def list_topics(category=None, before=None, limit=TOPICS_PER_PAGE):
+    """Return one page of topic headers (newest first) and the cursor for the next page
+    
+    Topics carry a reply_count instead of their replies. `before` is the cursor
+    returned for the previous page; the returned cursor is None on the last page.
+    """
+    session = Session()
+    try:
+        query = _topic_headers(session)
+        if category:
+            query = query.filter(Discussion.category == category)
+        if before:
+            # Keyset pagination: continue strictly after the last (created_at, id) shown.
+            # A row-value comparison, unlike the equivalent OR, is planned as an index range.
+            before_created_at = datetime.datetime.fromisoformat(before[0])
+            before_id = before[1]
+            query = query.filter(
+                tuple_(Discussion.created_at, Discussion.id) < tuple_(before_created_at, before_id))
+        
+        rows = query.order_by(Discussion.created_at.desc(), Discussion.id.desc()).limit(limit + 1).all()
+        topics = [_topic_header_dict(row) for row in rows[:limit]]
+        
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = (topics[-1]['created_at'], topics[-1]['id'])
+        return topics, next_cursor
+    finally:
+        session.close()
+
+def list_categories():
+    """Return the distinct categories that have at least one topic"""
+    session = Session()
+    try:
+        return [category for (category,) in 
+                session.query(Discussion.category).distinct().order_by(Discussion.category) if category]
+    finally:
+        session.close()
+
+SEARCH_LIMIT = 50
+
+def _fts_query(query):
+    """Turn free text into an FTS5 query: every word must match, each as a prefix"""
+    words = re.findall(r'\w+', query or '')
+    return ' '.join(f'"{word}"*' for word in words)
+
+def search_resources(query, level=None, type=None, tag=None, limit=SEARCH_LIMIT):
+    """Return ids of resources matching query and the given filters, best match first
+
+    The filters are applied inside the search, before the limit, so a narrow
+    filter still gets up to limit matches rather than what is left of the top ones.
+    """
+    fts_query = _fts_query(query)
+    if not fts_query:
+        return []
+    session = Session()
+    try:
+        rows = session.execute(text(
+            "SELECT f.resource_id FROM resources_fts f JOIN resources r ON r.rowid = f.rowid"
+            " WHERE resources_fts MATCH :q"
+            " AND (:level IS NULL OR r.level = :level) AND (:type IS NULL OR r.type = :type)"
+            " AND (:tag IS NULL OR EXISTS (SELECT 1 FROM resource_tag_association a JOIN tags t ON t.id = a.tag_id"
+            "   WHERE a.resource_id = r.id AND t.name = :tag))"
+            " ORDER BY f.rank LIMIT :limit"
+        ), {'q': fts_query, 'level': level, 'type': type, 'tag': tag, 'limit': limit})
+        return [resource_id for (resource_id,) in rows]
+    finally:
+        session.close()
+
+def search_projects(query, level=None, difficulty=None, skill=None, limit=SEARCH_LIMIT):
+    """Return ids of projects matching query and the given filters, best match first
+
+    Filtered before the limit, like search_resources.
+    """
+    fts_query = _fts_query(query)
+    if not fts_query:
+        return []
+    session = Session()
+    try:
+        rows = session.execute(text(
+            "SELECT f.project_id FROM projects_fts f JOIN projects p ON p.rowid = f.rowid"
+            " WHERE projects_fts MATCH :q"
+            " AND (:level IS NULL OR p.level = :level) AND (:difficulty IS NULL OR p.difficulty = :difficulty)"
+            " AND (:skill IS NULL OR EXISTS (SELECT 1 FROM project_skill_association a JOIN skills s ON s.id = a.skill_id"
+            "   WHERE a.project_id = p.id AND s.name = :skill))"
+            " ORDER BY f.rank LIMIT :limit"
+        ), {'q': fts_query, 'level': level, 'difficulty': difficulty, 'skill': skill, 'limit': limit})
+        return [project_id for (project_id,) in rows]
+    finally:
+        session.close()
+
+def search_topics(query, category=None, limit=SEARCH_LIMIT):
+    """Return headers of topics whose title, content or replies match query, best match first"""
+    fts_query = _fts_query(query)
+    if not fts_query:
+        return []
+    session = Session()
+    try:
+        rows = session.execute(text(
+            # Each side is ranked and limited on its own so FTS5 can stop early
+            "SELECT discussion_id, MIN(score) AS score FROM ("
+            "  SELECT * FROM (SELECT rowid AS discussion_id, rank AS score FROM discussions_fts"
+            "    WHERE discussions_fts MATCH :q AND (:category IS NULL OR category = :category)"
+            "    ORDER BY rank LIMIT :limit)"
+            "  UNION ALL"
+            "  SELECT * FROM (SELECT r.discussion_id, r.rank FROM replies_fts r JOIN discussions d ON d.id = r.discussion_id"
+            "    WHERE replies_fts MATCH :q AND (:category IS NULL OR d.category = :category)"
+            "    ORDER BY r.rank LIMIT :limit)"
+            ") GROUP BY discussion_id ORDER BY score LIMIT :limit"
+        ), {'q': fts_query, 'category': category, 'limit': limit}).all()
+        if not rows:
+            return []
+        
+        order = {int(discussion_id): i for i, (discussion_id, _) in enumerate(rows)}
+        headers = _topic_headers(session).filter(Discussion.id.in_(order)).all()
+        return [_topic_header_dict(row) for row in sorted(headers, key=lambda row: order[row.id])]
+    finally:
+        session.close()
+
+def load_replies(topic_id):
+    """Load the replies of one topic in posting order"""
+    session = Session()
+    try:
+        replies = session.query(Reply).filter_by(discussion_id=topic_id).order_by(Reply.created_at, Reply.id).all()
+        return [reply.to_dict() for reply in replies]
+    finally:
+        session.close()
+
 def add_topic(title, content, author, category):
     """Add a new discussion topic"""
     session = Session()
     try:
-        # Get next ID 
-        max_id = session.query(Discussion).order_by(Discussion.id.desc()).first()
-        next_id = 1 if max_id is None else max_id.id + 1
-        
-        # Create discussion
+        # Let SQLite assign the id so concurrent posts can never collide
         discussion = Discussion(
-            id=next_id,
             title=title,
             content=content,
             author=author,
@@ -158,8 +427,13 @@ def add_topic(title, content, author, category):
         )
         
         session.add(discussion)
+        session.flush()
+        topic_id = discussion.id
         session.commit()
-        return discussion.id
+        return topic_id
+    except Exception:
+        session.rollback()
+        raise
     finally:
         session.close()
 
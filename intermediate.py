@@ -1,7 +1,7 @@
 import streamlit as st
+import code_runner
 import json
 import utils
-import os
 
 # Page configuration
 st.set_page_config(
@@ -80,16 +80,12 @@ if filtered_resources:
                 st.success("✅ You've completed this resource")
                 if st.button("Mark as Incomplete", key=f"incomplete_{resource['id']}"):
                     st.session_state.resources_completed.remove(resource['id'])
-                    utils.save_user_progress(st.session_state.username, 
-                                         st.session_state.resources_completed,
-                                         st.session_state.current_level)
+                    utils.mark_resource_incomplete(st.session_state.username, resource['id'])
                     st.rerun()
             else:
                 if st.button("Mark as Completed", key=f"complete_{resource['id']}"):
                     st.session_state.resources_completed.append(resource['id'])
-                    utils.save_user_progress(st.session_state.username, 
-                                         st.session_state.resources_completed,
-                                         st.session_state.current_level)
+                    utils.mark_resource_completed(st.session_state.username, resource['id'])
                     st.rerun()
 else:
     st.info("No resources match your filter criteria. Try adjusting your filters.")
@@ -108,9 +104,7 @@ if completion_percentage >= 70:
     st.success("Congratulations! You've mastered intermediate Python concepts. You're ready to move on to advanced topics!")
     if st.session_state.current_level == "intermediate" and st.button("Move to Advanced Level"):
         st.session_state.current_level = "advanced"
-        utils.save_user_progress(st.session_state.username, 
-                             st.session_state.resources_completed,
-                             st.session_state.current_level)
+        utils.set_user_level(st.session_state.username, st.session_state.current_level)
         st.success("Level updated! You are now at the advanced level.")
         st.balloons()
 else:
@@ -379,31 +373,19 @@ st.write("Edit the code below and run it to see the results.")
 user_code = st.text_area("Code Editor", value=code_examples[selected_example], height=200)
 
 if st.button("Run Code"):
-    try:
-        # Create a file
-        with open("temp_code.py", "w") as f:
-            f.write(user_code)
-        
-        # Capture stdout
-        import io
-        import sys
-        from contextlib import redirect_stdout
-        
-        f = io.StringIO()
-        with redirect_stdout(f):
-            exec(user_code)
-        output = f.getvalue()
-        
-        # Display output
-        st.subheader("Output:")
-        st.code(output)
-        
-    except Exception as e:
-        st.error(f"Error: {e}")
-    finally:
-        # Clean up
-        if os.path.exists("temp_code.py"):
-            os.remove("temp_code.py")
+    st.subheader("Output:")
+    output_area = st.empty()
+    
+    # Run in a sandboxed worker process, in a private scratch directory,
+    # showing output as it is produced
+    result = code_runner.run_code(user_code, on_output=output_area.code, user=st.session_state.username)
+    
+    # Display output
+    output_area.code(result.output)
+    if result.truncated:
+        st.warning(f"Output was cut off after {code_runner.OUTPUT_LIMIT // 1024} KB.")
+    if not result.ok:
+        st.error(f"Error: {result.error}")
 
 # Further resources
 st.header("Intermediate Python Tips")
@@ -0,0 +1,139 @@
+"""Atomic, lock-protected JSON files
+
+Writers hold an exclusive advisory lock on a sidecar "<file>.lock" for the
+whole read-modify-write, so concurrent sessions (threads or processes) never
+lose each other's updates. New content is written to a temp file in the same
+directory and renamed over the old one, so readers, which take no lock, always
+see a complete file and a crash mid-write never leaves a truncated one.
+"""
+import contextlib
+import copy
+import json
+import os
+import tempfile
+import threading
+
+try:
+    import fcntl
+except ImportError:
+    # No advisory file locks (Windows): only threads in this process are serialised
+    fcntl = None
+
+# fsync policies
+FSYNC_NONE = 'none'     # leave flushing to the OS; a power loss may drop the latest writes
+FSYNC_FILE = 'file'     # fsync the new file before renaming it into place
+FSYNC_FULL = 'full'     # also fsync the directory, so the rename itself is durable
+
+_thread_locks = {}
+_thread_locks_guard = threading.Lock()
+# Per-thread lock depth by path, so a thread already holding a store's lock can take it again
+_held = threading.local()
+
+
+def _thread_lock(path):
+    with _thread_locks_guard:
+        return _thread_locks.setdefault(path, threading.Lock())
+
+
+class JsonStore:
+    """A JSON file with locked read-modify-write and atomic commits
+
+    default is returned by read() (and passed to update()) while the file does
+    not exist; it may be a value, which is copied, or a zero-argument callable.
+    """
+
+    def __init__(self, path, default=None, fsync=FSYNC_FILE, indent=4):
+        self.path = path
+        self.default = default
+        self.fsync = fsync
+        self.indent = indent
+        self.lock_path = path + '.lock'
+
+    def _default(self):
+        if callable(self.default):
+            return self.default()
+        return copy.deepcopy(self.default)
+
+    def read(self):
+        """Return the file's content, or the default if it does not exist yet"""
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return self._default()
+
+    @contextlib.contextmanager
+    def lock(self):
+        """Hold the store's exclusive lock (re-entrant within a thread)"""
+        path = os.path.abspath(self.path)
+        depths = _held.__dict__.setdefault('depths', {})
+        if depths.get(path):
+            depths[path] += 1
+            try:
+                yield
+            finally:
+                depths[path] -= 1
+            return
+
+        with _thread_lock(path):
+            with open(self.lock_path, 'a') as lock_file:
+                if fcntl:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                depths[path] = 1
+                try:
+                    yield
+                finally:
+                    depths[path] = 0
+                    if fcntl:
+                        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    @contextlib.contextmanager
+    def update(self):
+        """Read the content under the lock, yield it for changes in place, then commit it
+
+        Nothing is written if the block raises.
+        """
+        with self.lock():
+            data = self.read()
+            yield data
+            self._commit(data)
+
+    def write(self, data):
+        """Replace the content"""
+        with self.lock():
+            self._commit(data)
+
+    def create(self, data):
+        """Write data unless the file already exists; return True if it was written"""
+        with self.lock():
+            if os.path.exists(self.path):
+                return False
+            self._commit(data)
+            return True
+
+    def _commit(self, data):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            mode = os.stat(self.path).st_mode & 0o777
+        except FileNotFoundError:
+            mode = 0o644
+        fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(self.path) + '.', suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f, indent=self.indent)
+                if self.fsync != FSYNC_NONE:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.chmod(temp_path, mode)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(temp_path)
+            raise
+
+        if self.fsync == FSYNC_FULL:
+            dir_fd = os.open(directory, os.O_RDONLY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
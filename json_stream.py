@@ -0,0 +1,124 @@
+"""Incremental readers for large JSON files
+
+These parse one top-level entry at a time, so memory use is bounded by the
+largest single entry rather than by the size of the file.
+"""
+import json
+import re
+
+CHUNK_SIZE = 64 * 1024
+
+_decoder = json.JSONDecoder()
+_whitespace = re.compile(r'[ \t\n\r]*')
+
+
+class _ChunkedReader:
+    """Buffered view over a text file that decodes one JSON value at a time"""
+
+    def __init__(self, f, chunk_size=CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, size=None):
+        chunk = self.f.read(size or self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        # Drop what has been consumed so the buffer never grows past one entry
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Return the next non-whitespace character without consuming it ('' at EOF)"""
+        while True:
+            self.pos = _whitespace.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} in JSON stream, found {found!r}")
+        self.pos += 1
+
+    def value(self):
+        """Decode and consume the next complete JSON value"""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                # Value continues past the buffer; read at least as much again
+                if not self._fill(max(self.chunk_size, len(self.buf))):
+                    raise
+                continue
+            # A number at the end of the buffer may have been cut short (e.g. "12" of "12.5e3")
+            truncated = end == len(self.buf) or (
+                isinstance(value, (int, float)) and self.buf[end] in '.eE+-')
+            if truncated and not self.eof and self._fill():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_object_items(path, chunk_size=CHUNK_SIZE):
+    """Yield (key, value) pairs of the top-level JSON object in path"""
+    with open(path, 'r') as f:
+        reader = _ChunkedReader(f, chunk_size)
+        reader.expect('{')
+        if reader.peek() == '}':
+            return
+        while True:
+            key = reader.value()
+            reader.expect(':')
+            yield key, reader.value()
+
+            separator = reader.peek()
+            reader.pos += 1
+            if separator == '}':
+                return
+            if separator != ',':
+                raise ValueError(f"Malformed JSON object in {path}")
+
+
+def iter_array_items(path, key, chunk_size=CHUNK_SIZE):
+    """Yield the items of the array stored under key in the top-level JSON object in path
+
+    Other top-level entries are decoded and discarded.
+    """
+    with open(path, 'r') as f:
+        reader = _ChunkedReader(f, chunk_size)
+        reader.expect('{')
+        if reader.peek() == '}':
+            return
+        while True:
+            name = reader.value()
+            reader.expect(':')
+            if name == key and reader.peek() == '[':
+                reader.expect('[')
+                if reader.peek() == ']':
+                    reader.pos += 1
+                else:
+                    while True:
+                        yield reader.value()
+                        separator = reader.peek()
+                        reader.pos += 1
+                        if separator == ']':
+                            break
+                        if separator != ',':
+                            raise ValueError(f"Malformed JSON array in {path}")
+            else:
+                reader.value()
+
+            separator = reader.peek()
+            reader.pos += 1
+            if separator == '}':
+                return
+            if separator != ',':
+                raise ValueError(f"Malformed JSON object in {path}")
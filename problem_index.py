@@ -0,0 +1,52 @@
+"""Lookup tables over the practice problem catalog
+
+Built once per catalog version (see utils.load_problem_index) so the practice
+page filters, groups and counts problems with set operations on ids instead of
+scanning every problem on each rerun.
+"""
+
+
+class ProblemIndex:
+    """Practice problems by id, difficulty, tag and platform
+
+    The id sets are shared by every session and must not be modified in place;
+    combine them with &, | and - instead.
+    """
+
+    def __init__(self, catalog):
+        # catalog is {"leetcode": [...], "hackerrank": [...]}; its key names the platform
+        self.problems = []
+        self.by_id = {}
+        self.by_difficulty = {}
+        self.by_tag = {}
+        self.by_platform = {}
+
+        for platform, problems in catalog.items():
+            if not isinstance(problems, list):
+                continue
+            platform_ids = self.by_platform.setdefault(platform, set())
+            for problem in problems:
+                problem_id = problem["id"]
+                self.problems.append(problem)
+                self.by_id[problem_id] = problem
+                platform_ids.add(problem_id)
+                self.by_difficulty.setdefault(problem["difficulty"], set()).add(problem_id)
+                for tag in problem.get("tags", []):
+                    self.by_tag.setdefault(tag, set()).add(problem_id)
+
+        self.ids = frozenset(self.by_id)
+        self.tags = sorted(self.by_tag)
+        # Catalog position of each id, so selections keep the catalog's order
+        self._position = {problem["id"]: i for i, problem in enumerate(self.problems)}
+
+    def with_difficulty(self, difficulties):
+        """Return the ids of problems with any of the given difficulties"""
+        ids = set()
+        for difficulty in difficulties:
+            ids |= self.by_difficulty.get(difficulty, set())
+        return ids
+
+    def select(self, ids):
+        """Return the problems with the given ids, in catalog order"""
+        return [self.by_id[problem_id] for problem_id in sorted(
+            (problem_id for problem_id in ids if problem_id in self.by_id), key=self._position.get)]
@@ -1,9 +1,6 @@
 import streamlit as st
 import utils
-import pandas as pd
-import matplotlib.pyplot as plt
-import json
-import os
+from json_store import JsonStore
 from datetime import datetime, timedelta
 
 # Page configuration
@@ -81,7 +78,9 @@ st.write(f"Completed {len(completed_advanced)}/{len(advanced_resources)} resourc
 # Create visual chart of progress
 st.subheader("Visual Progress")
 
-# Create chart
+# Create chart (matplotlib is imported here rather than at the top, since it
+# is by far the slowest import on this page)
+import matplotlib.pyplot as plt
 fig, ax = plt.subplots(figsize=(10, 5))
 levels = ['Beginner', 'Intermediate', 'Advanced']
 percentages = [beginner_percentage, intermediate_percentage, advanced_percentage]
@@ -109,12 +108,11 @@ st.pyplot(fig)
 # Recently completed resources
 st.header("Recently Completed Resources")
 
-# Load user progress file to get timestamps
+# Load the user's progress record to get completion timestamps
 try:
-    with open(utils.USER_PROGRESS_FILE, 'r') as f:
-        progress_data = json.load(f)
-        
-    if username in progress_data and 'completed_resources' in progress_data[username]:
+    user_progress = utils.get_user_progress(username)
+    
+    if user_progress and 'completed_resources' in user_progress:
         # Get completed resources with timestamps if available
         completed_with_time = []
         
@@ -123,7 +121,7 @@ try:
             resource = next((r for r in resources if r['id'] == r_id), None)
             if resource:
                 # Try to get completion time if it exists
-                completion_time = progress_data[username].get('completion_times', {}).get(r_id)
+                completion_time = user_progress.get('completion_times', {}).get(r_id)
                 completed_with_time.append({
                     'id': r_id,
                     'title': resource['title'],
@@ -137,7 +135,8 @@ try:
         completed_with_time.sort(key=lambda x: x['completed_at'] if x['completed_at'] != 'Unknown' else '0', reverse=True)
         
         if completed_with_time:
-            # Display recent completions
+            # Display recent completions (pandas is only needed for this table)
+            import pandas as pd
             df = pd.DataFrame(completed_with_time[:5])  # Show most recent 5
             if 'completed_at' in df.columns:
                 df = df.rename(columns={'completed_at': 'Completed At', 'title': 'Title', 'level': 'Level', 'type': 'Type'})
@@ -160,60 +159,53 @@ except Exception as e:
 # Learning streaks
 st.header("Learning Streak")
 
-# Create or load streak data
-streak_file = "data/streaks.json"
-if not os.path.exists(streak_file):
-    with open(streak_file, 'w') as f:
-        json.dump({}, f)
+# Streak data is shared by every session, so updates are locked and atomic
+streak_store = JsonStore("data/streaks.json", default={}, indent=None)
 
 try:
-    with open(streak_file, 'r') as f:
-        streak_data = json.load(f)
-    
-    # Initialize user streak data if not exists
-    if username not in streak_data:
-        streak_data[username] = {
-            'current_streak': 0,
-            'longest_streak': 0,
-            'last_active': None,
-            'active_days': []
-        }
-    
     # Update streak for today
     today = datetime.now().strftime('%Y-%m-%d')
+    streak_data = streak_store.read()
     
-    # Update if this is the first visit today
-    if today not in streak_data[username]['active_days']:
-        streak_data[username]['active_days'].append(today)
-        
-        # Check if continuing a streak
-        if streak_data[username]['last_active']:
-            last_date = datetime.strptime(streak_data[username]['last_active'], '%Y-%m-%d')
-            today_date = datetime.strptime(today, '%Y-%m-%d')
-            days_diff = (today_date - last_date).days
+    # Update if this is the first visit today (checked again under the lock)
+    if username not in streak_data or today not in streak_data[username]['active_days']:
+        with streak_store.update() as streak_data:
+            # Initialize user streak data if not exists
+            if username not in streak_data:
+                streak_data[username] = {
+                    'current_streak': 0,
+                    'longest_streak': 0,
+                    'last_active': None,
+                    'active_days': []
+                }
             
-            if days_diff == 1:  # Sequential day
-                streak_data[username]['current_streak'] += 1
-            elif days_diff > 1:  # Streak broken
-                streak_data[username]['current_streak'] = 1
-            # If same day, no change to streak
-        else:
-            # First activity ever
-            streak_data[username]['current_streak'] = 1
-        
-        # Update last active day
-        streak_data[username]['last_active'] = today
-        
-        # Update longest streak if current is longer
-        if streak_data[username]['current_streak'] > streak_data[username]['longest_streak']:
-            streak_data[username]['longest_streak'] = streak_data[username]['current_streak']
-        
-        # Limit active_days list to last 30 days
-        streak_data[username]['active_days'] = sorted(streak_data[username]['active_days'])[-30:]
-        
-        # Save updated streak data
-        with open(streak_file, 'w') as f:
-            json.dump(streak_data, f)
+            if today not in streak_data[username]['active_days']:
+                streak_data[username]['active_days'].append(today)
+                
+                # Check if continuing a streak
+                if streak_data[username]['last_active']:
+                    last_date = datetime.strptime(streak_data[username]['last_active'], '%Y-%m-%d')
+                    today_date = datetime.strptime(today, '%Y-%m-%d')
+                    days_diff = (today_date - last_date).days
+                    
+                    if days_diff == 1:  # Sequential day
+                        streak_data[username]['current_streak'] += 1
+                    elif days_diff > 1:  # Streak broken
+                        streak_data[username]['current_streak'] = 1
+                    # If same day, no change to streak
+                else:
+                    # First activity ever
+                    streak_data[username]['current_streak'] = 1
+                
+                # Update last active day
+                streak_data[username]['last_active'] = today
+                
+                # Update longest streak if current is longer
+                if streak_data[username]['current_streak'] > streak_data[username]['longest_streak']:
+                    streak_data[username]['longest_streak'] = streak_data[username]['current_streak']
+                
+                # Limit active_days list to last 30 days
+                streak_data[username]['active_days'] = sorted(streak_data[username]['active_days'])[-30:]
     
     # Display streak information
     current_streak = streak_data[username]['current_streak']
@@ -290,7 +282,7 @@ if recommendations:
             if resource['id'] not in completed_resources:
                 if st.button("Mark as Completed", key=f"complete_{resource['id']}"):
                     st.session_state.resources_completed.append(resource['id'])
-                    utils.save_user_progress(username, completed_resources, current_level)
+                    utils.mark_resource_completed(username, resource['id'])
                     st.rerun()
             else:
                 st.success("Completed ✓")
@@ -330,7 +322,7 @@ if current["next_level"] is not None:
         st.success(f"Congratulations! You're ready to move up to the {current['next_level']} level!")
         if st.button(f"Move to {current['next_level'].capitalize()} Level"):
             st.session_state.current_level = current['next_level']
-            utils.save_user_progress(username, completed_resources, current['next_level'])
+            utils.set_user_level(username, current['next_level'])
             st.success(f"Level updated! You are now at the {current['next_level']} level.")
             st.balloons()
             st.rerun()
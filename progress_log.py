@@ -0,0 +1,217 @@
+"""Append-only log of user progress events
+
+Every change (a resource completed or uncompleted, a level change) is one JSON
+line appended to a log next to the progress snapshot, so saving costs one small
+append instead of rewriting everyone's progress. Once the log grows past
+COMPACT_BYTES it is folded into the snapshot, which keeps the usual
+user_progress.json layout, and truncated.
+
+Each event sets or clears a single value, so replaying events the snapshot
+already includes changes nothing; a crash between writing the snapshot and
+truncating the log is harmless.
+
+ShardedProgressLog keeps one such snapshot and log per user, hashed into
+subdirectories, so reads and writes cost the same however many users there
+are and different users never contend on the same file.
+"""
+import contextlib
+import hashlib
+import json
+import os
+from datetime import datetime
+from json_store import JsonStore, FSYNC_NONE
+from json_stream import iter_object_items
+
+COMPACT_BYTES = 256 * 1024   # log size that triggers folding it into the snapshot
+SHARD_COMPACT_BYTES = 16 * 1024
+
+
+def _new_record():
+    return {'completed_resources': [], 'current_level': 'beginner', 'completion_times': {}}
+
+
+def apply_event(progress, event):
+    """Apply one event to a {username: record} dict in place"""
+    record = progress.setdefault(event['user'], _new_record())
+    completed = record.setdefault('completed_resources', [])
+    times = record.setdefault('completion_times', {})
+    kind = event['event']
+
+    if kind == 'completed':
+        if event['resource_id'] not in completed:
+            completed.append(event['resource_id'])
+            times[event['resource_id']] = event['at']
+    elif kind == 'uncompleted':
+        if event['resource_id'] in completed:
+            completed.remove(event['resource_id'])
+        times.pop(event['resource_id'], None)
+    elif kind == 'level':
+        record['current_level'] = event['level']
+    elif kind == 'set':
+        # Whole-record save: keep completion times of resources that stay completed
+        for resource_id in event['completed_resources']:
+            times.setdefault(resource_id, event['at'])
+        for resource_id in set(times) - set(event['completed_resources']):
+            del times[resource_id]
+        record['completed_resources'] = list(event['completed_resources'])
+        record['current_level'] = event['current_level']
+    record['last_updated'] = event['at']
+
+
+class ProgressLog:
+    """User progress stored as a JSON snapshot plus an append-only event log"""
+
+    def __init__(self, snapshot_path, compact_bytes=COMPACT_BYTES):
+        self.snapshot = JsonStore(snapshot_path, default={})
+        self.log_path = os.path.splitext(snapshot_path)[0] + '.log'
+        self.compact_bytes = compact_bytes
+
+    def append(self, username, event, **fields):
+        """Record one event for username"""
+        line = json.dumps({'user': username, 'event': event, 'at': datetime.now().isoformat(), **fields}) + '\n'
+        # The snapshot's lock also guards the log, so appends never race a compaction
+        with self.snapshot.lock():
+            with open(self.log_path, 'a') as f:
+                f.write(line)
+                if self.snapshot.fsync != FSYNC_NONE:
+                    f.flush()
+                    os.fsync(f.fileno())
+                size = f.tell()
+            if size >= self.compact_bytes:
+                self._compact()
+
+    def _events(self):
+        try:
+            with open(self.log_path, 'r') as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        # Only the last line can be partial, while an append is in flight
+                        continue
+        except FileNotFoundError:
+            return
+
+    def load_user(self, username):
+        """Return username's progress record (snapshot plus logged events), or None"""
+        # Read the log before the snapshot: if a compaction lands in between, the
+        # new snapshot already holds these events and replaying them changes nothing
+        events = [event for event in self._events() if event['user'] == username]
+        progress = {}
+        if os.path.exists(self.snapshot.path):
+            # Stream the snapshot and stop at this user rather than parsing everyone's progress
+            for name, record in iter_object_items(self.snapshot.path):
+                if name == username:
+                    progress[username] = record
+                    break
+        for event in events:
+            apply_event(progress, event)
+        return progress.get(username)
+
+    def load_all(self):
+        """Return every user's record (snapshot plus logged events)"""
+        events = list(self._events())
+        progress = self.snapshot.read()
+        for event in events:
+            apply_event(progress, event)
+        return progress
+
+    def compact(self):
+        """Fold the log into the snapshot and truncate it"""
+        if not os.path.exists(self.log_path):
+            return
+        with self.snapshot.lock():
+            self._compact()
+
+    def _compact(self):
+        events = list(self._events())
+        if not events:
+            return
+        with self.snapshot.update() as progress:
+            for event in events:
+                apply_event(progress, event)
+        # Still under the lock, so no append can land between the snapshot and the truncation
+        open(self.log_path, 'w').close()
+
+
+class ShardedProgressLog:
+    """Per-user ProgressLogs stored under root/<hash[:2]>/<hash>.json
+
+    Users still in the legacy single-file log are moved into shards by
+    split_legacy(). Until that has run, they are read from the legacy log and
+    a user's shard is seeded from it on their first write.
+    """
+
+    def __init__(self, root, legacy_path=None):
+        self.root = root
+        self.legacy = ProgressLog(legacy_path) if legacy_path else None
+
+    def _shard_path(self, username):
+        digest = hashlib.sha1(username.encode('utf-8')).hexdigest()
+        return os.path.join(self.root, digest[:2], digest + '.json')
+
+    def _shard(self, username):
+        return ProgressLog(self._shard_path(username), compact_bytes=SHARD_COMPACT_BYTES)
+
+    def split_legacy(self):
+        """Move every user in the legacy log into their own shard; return how many were moved
+
+        Streams the legacy snapshot once, then renames it with a .migrated
+        suffix, so reads no longer fall back to scanning it. Users who already
+        have a shard keep it. A no-op once done.
+        """
+        if not self.legacy or not (os.path.exists(self.legacy.snapshot.path) or os.path.exists(self.legacy.log_path)):
+            return 0
+        moved = 0
+        with self.legacy.snapshot.lock():
+            self.legacy._compact()
+            # Another process may have finished the split while this one waited for the lock
+            if os.path.exists(self.legacy.snapshot.path):
+                for username, record in iter_object_items(self.legacy.snapshot.path):
+                    path = self._shard_path(username)
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    # Not synced one by one; everything is flushed before the legacy file goes
+                    if JsonStore(path, fsync=FSYNC_NONE).create({username: record}):
+                        moved += 1
+                if hasattr(os, 'sync'):
+                    os.sync()
+                os.replace(self.legacy.snapshot.path, self.legacy.snapshot.path + '.migrated')
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(self.legacy.log_path)
+        return moved
+
+    def append(self, username, event, **fields):
+        """Record one event for username"""
+        shard = self._shard(username)
+        if not os.path.exists(shard.snapshot.path):
+            os.makedirs(os.path.dirname(shard.snapshot.path), exist_ok=True)
+            record = self.legacy.load_user(username) if self.legacy else None
+            shard.snapshot.create({username: record} if record else {})
+        shard.append(username, event, **fields)
+
+    def load_user(self, username):
+        """Return username's progress record, or None"""
+        shard = self._shard(username)
+        if os.path.exists(shard.snapshot.path):
+            return shard.load_user(username)
+        return self.legacy.load_user(username) if self.legacy else None
+
+    def iter_users(self):
+        """Yield (username, record) for every user
+
+        Compacts the legacy log first so its snapshot can be streamed.
+        """
+        seen = set()
+        for directory, _, files in os.walk(self.root):
+            for name in sorted(files):
+                if name.endswith('.json'):
+                    for username, record in ProgressLog(os.path.join(directory, name)).load_all().items():
+                        seen.add(username)
+                        yield username, record
+
+        if self.legacy:
+            self.legacy.compact()
+        if self.legacy and os.path.exists(self.legacy.snapshot.path):
+            for username, record in iter_object_items(self.legacy.snapshot.path):
+                if username not in seen:
+                    yield username, record
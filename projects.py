@@ -1,7 +1,8 @@
 import streamlit as st
+import code_runner
 import utils
-import pandas as pd
-import os
+import db_utils
+import time
 
 # Page configuration
 st.set_page_config(
@@ -18,6 +19,9 @@ if "username" not in st.session_state or not st.session_state.username:
 # Load projects
 projects = utils.load_projects()
 
+# Set when a background run is still going, so the page polls it again
+job_running = False
+
 # Header
 st.title("🛠️ Python Projects")
 st.write("""
@@ -53,6 +57,19 @@ if selected_difficulty != "All Difficulties":
 if selected_skill != "All Skills":
     filtered_projects = [p for p in filtered_projects if selected_skill in p.get("skills", [])]
 
+# Full-text search (ranked, matches word prefixes)
+search_query = st.sidebar.text_input("Search Projects")
+if search_query:
+    # Filtered in the search itself, so the ranked matches are all ones this page can show
+    search_ids = db_utils.search_projects(
+        search_query,
+        level=None if selected_level == "All Levels" else selected_level,
+        difficulty=int(selected_difficulty) if selected_difficulty.isdigit() else None,
+        skill=None if selected_skill == "All Skills" else selected_skill)
+    search_rank = {project_id: i for i, project_id in enumerate(search_ids)}
+    filtered_projects = sorted([p for p in filtered_projects if p["id"] in search_rank],
+                               key=lambda p: search_rank[p["id"]])
+
 # Display projects
 if not filtered_projects:
     st.info("No projects match your filter criteria. Try adjusting your filters.")
@@ -166,39 +183,37 @@ if "current_project" in st.session_state:
         # Save the code in session state
         st.session_state[user_code_key] = user_code
         
+        # Projects can run for a while, so they run in the background: the job id
+        # is kept in session state and the page polls it instead of blocking
+        job_key = f"job_{project['id']}_{st.session_state.username}"
+        
         col1, col2 = st.columns(2)
         with col1:
             if st.button("Run Code"):
-                try:
-                    # Create a file
-                    with open("temp_project_code.py", "w") as f:
-                        f.write(user_code)
-                    
-                    # Capture stdout
-                    import io
-                    import sys
-                    from contextlib import redirect_stdout
-                    
-                    f = io.StringIO()
-                    with redirect_stdout(f):
-                        exec(user_code)
-                    output = f.getvalue()
-                    
-                    # Display output
-                    st.subheader("Output:")
-                    st.code(output)
-                    
-                except Exception as e:
-                    st.error(f"Error: {e}")
-                finally:
-                    # Clean up
-                    if os.path.exists("temp_project_code.py"):
-                        os.remove("temp_project_code.py")
+                st.session_state[job_key] = code_runner.submit_code(user_code, user=st.session_state.username)
         
         with col2:
             if st.button("Clear Code"):
                 st.session_state[user_code_key] = project.get('starter_code', '# Your code here\n\n')
                 st.rerun()
+        
+        if job_key in st.session_state:
+            job = code_runner.get_job(st.session_state[job_key])
+            if job is None:
+                # Expired or lost with a server restart
+                del st.session_state[job_key]
+            else:
+                # Display output
+                st.subheader("Output:")
+                st.code(job.output)
+                if not job.done:
+                    st.info("Running...")
+                    job_running = True
+                else:
+                    if job.result.truncated:
+                        st.warning(f"Output was cut off after {code_runner.OUTPUT_LIMIT // 1024} KB.")
+                    if not job.result.ok:
+                        st.error(f"Error: {job.result.error}")
     
     with tab3:
         st.subheader("Helpful Resources")
@@ -324,3 +339,8 @@ with cols[1]:
 with cols[2]:
     if st.button("Community Forum 💬"):
         st.switch_page("pages/community.py")
+
+# Poll a background run: rerun the page shortly to pick up new output
+if job_running:
+    time.sleep(code_runner.JOB_POLL_INTERVAL)
+    st.rerun()
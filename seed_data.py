@@ -0,0 +1,19 @@
+"""Default content used to seed an empty data directory
+
+The seed content lives in versioned JSON files under seed/ and is only read
+when a data file has to be created, so importing the app never pays for it.
+"""
+import json
+import os
+
+SEED_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "seed")
+SEED_VERSION = 1
+
+
+def load_seed(name):
+    """Return the content of seed/<name>.json"""
+    with open(os.path.join(SEED_DIR, f"{name}.json"), 'r', encoding='utf-8') as f:
+        seed = json.load(f)
+    if seed.get("version") != SEED_VERSION:
+        raise ValueError(f"Seed file {name}.json has version {seed.get('version')}, expected {SEED_VERSION}")
+    return seed["data"]
@@ -5,11 +5,16 @@ This file is configured as the main file for Streamlit Cloud deployment
 import os
 import sys
 import database
+
+# Checked before importing the app, whose first database access creates the file
+new_database = not os.path.exists(os.path.join('data', 'python_learning.db'))
+
+# Importing the app (through db_utils) runs database.ensure_db(), which creates
+# any tables added since the database was first built
 from app_updated import *
 
-# Initialize the database if it's not already created
-if not os.path.exists(os.path.join('data', 'python_learning.db')):
+# Fill a new database from the JSON files, once
+if new_database:
     print("Initializing database...")
-    database.init_db()
     database.migrate_from_json()
-    print("Database initialization complete!")
\ No newline at end of file
+    print("Database initialization complete!")
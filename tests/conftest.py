@@ -0,0 +1,75 @@
+import pytest
+from sqlalchemy import event
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """database module bound to a fresh SQLite file in tmp_path
+
+    Runs in tmp_path so the data/ directory the modules create at import
+    time never lands in the working tree.
+    """
+    monkeypatch.chdir(tmp_path)
+    import database
+    from catalog_cache import catalog_cache
+
+    engine = database.create_db_engine(str(tmp_path / 'test.db'))
+    original = database.engine
+    monkeypatch.setattr(database, 'engine', engine)
+    database.Session.configure(bind=engine)
+    database.Base.metadata.create_all(engine)
+    database.upgrade_db()
+    catalog_cache.invalidate()
+    yield database
+    catalog_cache.invalidate()
+    database.Session.configure(bind=original)
+    engine.dispose()
+
+
+@pytest.fixture
+def db_utils(db):
+    import db_utils
+    return db_utils
+
+
+class StatementRecorder:
+    """Records the SQL statements (with parameters) an engine executes"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append((statement, parameters))
+
+    def __enter__(self):
+        self.statements = []
+        event.listen(self.engine, 'before_cursor_execute', self._record)
+        return self
+
+    def __exit__(self, *exc_info):
+        event.remove(self.engine, 'before_cursor_execute', self._record)
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    def plans(self):
+        """EXPLAIN QUERY PLAN each recorded query; return (statement, plan) pairs
+
+        A plan is its detail lines joined with " | ". Bulk inserts (executemany)
+        and statements other than SELECT, UPDATE and DELETE are skipped.
+        """
+        plans = []
+        with self.engine.connect() as conn:
+            for statement, parameters in self.statements:
+                if isinstance(parameters, list) or statement.split(None, 1)[0].upper() not in ('SELECT', 'UPDATE', 'DELETE'):
+                    continue
+                rows = conn.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters)
+                plans.append((statement, ' | '.join(row[3] for row in rows)))
+        return plans
+
+
+@pytest.fixture
+def record_statements(db):
+    return lambda: StatementRecorder(db.engine)
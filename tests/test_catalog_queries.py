@@ -0,0 +1,52 @@
+"""The catalog loaders must not issue a query per resource or project"""
+import pytest
+
+
+def _add_catalog(db, count):
+    """Insert count resources with two tags each and count projects with two skills each"""
+    tags = [{'id': i, 'name': f'tag{i}'} for i in range(1, 21)]
+    resources = [{'id': f'r{i}', 'title': f'Resource {i}', 'type': 'Article', 'level': 'beginner'}
+                 for i in range(count)]
+    projects = [{'id': f'p{i}', 'title': f'Project {i}', 'level': 'beginner', 'difficulty': 1}
+                for i in range(count)]
+    with db.engine.begin() as conn:
+        conn.execute(db.Tag.__table__.insert(), tags)
+        conn.execute(db.Skill.__table__.insert(), tags)
+        conn.execute(db.Resource.__table__.insert(), resources)
+        conn.execute(db.Project.__table__.insert(), projects)
+        conn.execute(db.resource_tag_association.insert(),
+                     [{'resource_id': f'r{i}', 'tag_id': i % 20 + 1} for i in range(count)]
+                     + [{'resource_id': f'r{i}', 'tag_id': (i + 1) % 20 + 1} for i in range(count)])
+        conn.execute(db.project_skill_association.insert(),
+                     [{'project_id': f'p{i}', 'skill_id': i % 20 + 1} for i in range(count)]
+                     + [{'project_id': f'p{i}', 'skill_id': (i + 1) % 20 + 1} for i in range(count)])
+
+
+@pytest.mark.parametrize('loader', ['load_resources', 'load_projects'])
+def test_catalog_statement_count_does_not_grow(db, db_utils, record_statements, loader):
+    from catalog_cache import catalog_cache
+
+    counts = {}
+    loaded = {}
+    for total in (10, 10000):
+        with db.engine.begin() as conn:
+            for table in reversed(db.Base.metadata.sorted_tables):
+                conn.execute(table.delete())
+        _add_catalog(db, total)
+        catalog_cache.invalidate()
+        with record_statements() as recorder:
+            loaded[total] = getattr(db_utils, loader)()
+        counts[total] = recorder.count
+
+    assert len(loaded[10000]) == 10000
+    assert counts[10000] == counts[10]
+    names = 'tags' if loader == 'load_resources' else 'skills'
+    assert all(len(item[names]) == 2 for item in loaded[10000])
+
+
+def test_cached_catalog_costs_one_version_check(db, db_utils, record_statements):
+    _add_catalog(db, 10)
+    db_utils.load_resources()
+    with record_statements() as recorder:
+        assert len(db_utils.load_resources()) == 10
+    assert recorder.count <= 1
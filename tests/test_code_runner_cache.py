@@ -0,0 +1,30 @@
+"""Only snippets that cannot reach the outside world are treated as cacheable"""
+import pytest
+
+from code_runner import is_deterministic
+
+
+@pytest.mark.parametrize('code', [
+    "print(open('/etc/hostname').read())",
+    "print(__builtins__.open('/etc/hostname').read())",
+    "print(getattr(__builtins__, 'open')('/etc/hostname').read())",
+    "print(globals()['__builtins__'])",
+    "print(vars()['__builtins__'])",
+    "print(locals())",
+    "reach = getattr\nprint(reach)",
+    "print(().__class__.__base__.__subclasses__())",
+    "import operator\nprint(operator.attrgetter('__class__')(1))",
+    "import random\nprint(random.random())",
+])
+def test_nondeterministic_snippets_are_not_cached(code):
+    assert not is_deterministic(code)
+
+
+@pytest.mark.parametrize('code', [
+    "print(sum(range(10)))",
+    "import math\nprint(math.pi)",
+    "if __name__ == '__main__':\n    print('hi')",
+    "class Point:\n    def __init__(self, x):\n        self.x = x\nprint(Point(1).x)",
+])
+def test_deterministic_snippets_are_cached(code):
+    assert is_deterministic(code)
@@ -0,0 +1,52 @@
+"""Concurrent runs each get a private, empty working directory"""
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import code_runner
+
+RUNS = 200
+
+SNIPPET = '''
+import os
+import time
+before = sorted(os.listdir('.'))
+with open('scratch.txt', 'w') as f:
+    f.write({token!r})
+time.sleep(0.01)
+with open('scratch.txt') as f:
+    print(before, f.read())
+'''
+
+
+@pytest.fixture
+def runner(monkeypatch):
+    runner = code_runner.CodeRunner()
+    monkeypatch.setattr(code_runner, '_runner', runner)
+    yield runner
+    runner.shutdown()
+
+
+def _workspace_files(runner):
+    return [os.path.join(directory, name)
+            for directory, _, files in os.walk(runner.workspaces.root) for name in files]
+
+
+def test_runs_never_see_each_others_files(runner):
+    def run(i):
+        return code_runner.run_code(SNIPPET.format(token=f'run-{i}'))
+
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(run, range(RUNS)))
+
+    for i, result in enumerate(results):
+        assert result.status == 'ok', result.error
+        assert result.output.strip() == f"[] run-{i}"
+
+    # Released directories are emptied in the background
+    deadline = time.monotonic() + 5
+    while _workspace_files(runner) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert _workspace_files(runner) == []
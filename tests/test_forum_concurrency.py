@@ -0,0 +1,25 @@
+"""Concurrent posts must all land, each with its own id"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import func, select
+
+POSTS = 400
+THREADS = 16
+
+
+def test_concurrent_topics_get_distinct_ids(db, db_utils):
+    started = time.perf_counter()
+    with ThreadPoolExecutor(THREADS) as executor:
+        ids = list(executor.map(
+            lambda i: db_utils.add_topic(f'Topic {i}', 'Hello', f'user{i % THREADS}', 'General'), range(POSTS)))
+    elapsed = time.perf_counter() - started
+    print(f"{POSTS / elapsed:.0f} posts/sec with {THREADS} threads")
+
+    assert len(set(ids)) == POSTS
+    with db.engine.connect() as conn:
+        assert conn.execute(select(func.count()).select_from(db.Discussion.__table__)).scalar() == POSTS
+
+    with ThreadPoolExecutor(THREADS) as executor:
+        assert all(executor.map(lambda i: db_utils.add_reply(ids[i % 10], f'Reply {i}', 'ann'), range(POSTS)))
+    assert sum(len(db_utils.load_replies(topic_id)) for topic_id in ids[:10]) == POSTS
@@ -0,0 +1,20 @@
+"""Completions kept in the old practice problem catalog move into completed_problems"""
+import json
+
+
+def test_catalog_completions_are_moved_into_the_database(db, db_utils, tmp_path):
+    catalog = {
+        'leetcode': [{'id': 'lc1', 'title': 'Two Sum', 'difficulty': 'Easy'}],
+        'hackerrank': [{'id': 'hr1', 'title': 'Say Hello', 'difficulty': 'Basic'}],
+    }
+    path = tmp_path / 'practice_problems.json'
+    path.write_text(json.dumps(dict(catalog, completed_problems={'ann': ['lc1', 'hr1', 'lc1'], 'bob': ['hr1']})))
+    db_utils.mark_problem_completed('bob', 'hr1')
+
+    assert db.migrate_practice_completions(str(path)) == 3
+
+    assert db_utils.get_completed_problems('ann') == {'lc1', 'hr1'}
+    assert db_utils.get_completed_problems('bob') == {'hr1'}
+    # The catalog is left as it was, minus the completions
+    assert json.loads(path.read_text()) == catalog
+    assert db.migrate_practice_completions(str(path)) == 0
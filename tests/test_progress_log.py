@@ -0,0 +1,25 @@
+"""Legacy single-file progress is split into per-user shards once"""
+import json
+
+from progress_log import ProgressLog, ShardedProgressLog
+
+
+def test_split_legacy_moves_every_user_into_a_shard(tmp_path):
+    legacy_path = tmp_path / 'user_progress.json'
+    legacy_path.write_text(json.dumps({
+        f'u{i}': {'completed_resources': [f'r{i}'], 'current_level': 'beginner', 'completion_times': {}}
+        for i in range(50)}))
+    ProgressLog(str(legacy_path)).append('u1', 'level', level='advanced')
+    log = ShardedProgressLog(str(tmp_path / 'progress'), legacy_path=str(legacy_path))
+    # Written before the split, so its shard already exists and is kept
+    log.append('u2', 'level', level='intermediate')
+
+    assert log.split_legacy() == 49
+    assert not legacy_path.exists()
+    assert log.split_legacy() == 0
+
+    assert log.load_user('u1')['current_level'] == 'advanced'
+    assert log.load_user('u2')['current_level'] == 'intermediate'
+    assert log.load_user('u49')['completed_resources'] == ['r49']
+    assert log.load_user('nobody') is None
+    assert len(dict(log.iter_users())) == 50
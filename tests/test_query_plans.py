@@ -0,0 +1,90 @@
+"""The hot queries must be answered from their indexes, not by scanning or sorting tables"""
+import datetime
+
+
+def _plans(record_statements, action):
+    with record_statements() as recorder:
+        action()
+    plans = recorder.plans()
+    assert plans
+    return plans
+
+
+def _assert_no_scan(plans, *tables):
+    for statement, plan in plans:
+        for table in tables:
+            assert f'SCAN {table}' not in plan, f"{statement}\n-> {plan}"
+        assert 'USE TEMP B-TREE' not in plan, f"{statement}\n-> {plan}"
+
+
+def _add_resources(db, count=300):
+    levels = ['beginner', 'intermediate', 'advanced']
+    with db.engine.begin() as conn:
+        conn.execute(db.Resource.__table__.insert(),
+                     [{'id': f'r{i}', 'title': f'Resource {i}', 'level': levels[i % 3]} for i in range(count)])
+
+
+def _add_topics(db, count=300):
+    start = datetime.datetime(2024, 1, 1)
+    with db.engine.begin() as conn:
+        conn.execute(db.User.__table__.insert(), [{'username': 'ann'}])
+        conn.execute(db.Discussion.__table__.insert(), [
+            {'title': f'Topic {i}', 'content': '', 'author': 'ann', 'category': ['General', 'Help'][i % 2],
+             'created_at': start + datetime.timedelta(minutes=i)} for i in range(count)])
+        conn.execute(db.Reply.__table__.insert(), [
+            {'discussion_id': i % count + 1, 'content': '', 'author': 'ann',
+             'created_at': start + datetime.timedelta(minutes=i)} for i in range(count * 2)])
+
+
+def test_recommendations_use_level_index(db, db_utils, record_statements):
+    _add_resources(db)
+    plans = _plans(record_statements, lambda: db_utils.get_recommendations('beginner', ['r0', 'r3', 'r6']))
+    assert any('ix_resources_level (level=?)' in plan for _, plan in plans)
+    assert any('INTEGER PRIMARY KEY (rowid=?)' in plan for _, plan in plans)
+    _assert_no_scan(plans, 'resources')
+
+
+def test_recommendations_fallback_uses_level_index(db, db_utils, record_statements, monkeypatch):
+    _add_resources(db)
+    # No random draw lands, so every pick walks the level's index instead
+    monkeypatch.setattr(db_utils, 'SAMPLE_ATTEMPTS', 0)
+    plans = _plans(record_statements, lambda: db_utils.get_recommendations('beginner', ['r0', 'r3', 'r6']))
+    assert any('ix_resources_level (level=? AND rowid>?)' in plan for _, plan in plans)
+    _assert_no_scan(plans, 'resources')
+
+
+def test_progress_queries_use_unique_completion_index(db, db_utils, record_statements):
+    _add_resources(db)
+    db_utils.save_user_progress('ann', ['r0', 'r1', 'r2'], 'beginner')
+    plans = _plans(record_statements, lambda: db_utils.save_user_progress('ann', ['r1', 'r4'], 'beginner'))
+    assert any('uq_completed_resources_user_resource (user_username=?' in plan for _, plan in plans)
+    _assert_no_scan(plans, 'completed_resources')
+
+
+def test_completed_problems_use_unique_index(db, db_utils, record_statements):
+    db_utils.mark_problem_completed('ann', 'lc1')
+    plans = _plans(record_statements, lambda: db_utils.get_completed_problems('ann'))
+    assert any('uq_completed_problems_user_problem (user_username=?)' in plan for _, plan in plans)
+    _assert_no_scan(plans, 'completed_problems')
+
+
+def test_forum_listing_pages_are_index_ranges(db, db_utils, record_statements):
+    _add_topics(db)
+    _, cursor = db_utils.list_topics()
+    _, category_cursor = db_utils.list_topics(category='Help')
+
+    plans = _plans(record_statements, lambda: db_utils.list_topics(before=cursor))
+    assert any('ix_discussions_created_at (created_at<?)' in plan for _, plan in plans)
+    assert any('ix_replies_discussion_created_at (discussion_id=?)' in plan for _, plan in plans)
+    _assert_no_scan(plans, 'discussions', 'replies')
+
+    plans = _plans(record_statements, lambda: db_utils.list_topics(category='Help', before=category_cursor))
+    assert any('ix_discussions_category_created_at (category=? AND created_at<?)' in plan for _, plan in plans)
+    _assert_no_scan(plans, 'discussions', 'replies')
+
+
+def test_replies_load_in_index_order(db, db_utils, record_statements):
+    _add_topics(db)
+    plans = _plans(record_statements, lambda: db_utils.load_replies(5))
+    assert any('ix_replies_discussion_created_at (discussion_id=?)' in plan for _, plan in plans)
+    _assert_no_scan(plans, 'replies')
@@ -0,0 +1,19 @@
+"""Per-user rate limiting keeps state only for recently active users"""
+import types
+
+import code_runner
+
+
+def test_idle_buckets_are_dropped_when_new_users_arrive(monkeypatch):
+    clock = types.SimpleNamespace(now=0.0)
+    monkeypatch.setattr(code_runner, 'time', types.SimpleNamespace(monotonic=lambda: clock.now))
+    limiter = code_runner.RateLimiter(max_buckets=100)
+
+    for i in range(20000):
+        assert limiter.acquire(f'user{i}') == 0
+    # All still active, so all are kept
+    assert len(limiter._buckets) == 20000
+
+    clock.now += limiter.burst / limiter.rate + 1
+    assert limiter.acquire('newcomer') == 0
+    assert len(limiter._buckets) == 1
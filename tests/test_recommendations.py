@@ -0,0 +1,15 @@
+"""Recommendations are drawn uniformly from the resources not yet completed"""
+from collections import Counter
+
+
+def test_sampling_does_not_favour_resources_after_completed_ones(db, db_utils):
+    with db.engine.begin() as conn:
+        conn.execute(db.Resource.__table__.insert(),
+                     [{'id': f'r{i}', 'title': f'Resource {i}', 'level': 'advanced'} for i in range(20)])
+    # r10 follows ten completed resources; a walk to the next eligible one would pick it about half the time
+    completed = [f'r{i}' for i in range(10)]
+    picks = Counter(resource['id'] for _ in range(1000)
+                    for resource in db_utils.get_recommendations('advanced', completed, limit=1))
+
+    assert set(picks) == {f'r{i}' for i in range(10, 20)}
+    assert picks['r10'] < 1000 * 0.2
@@ -0,0 +1,29 @@
+"""Search filters are applied before the result limit"""
+
+
+def test_resource_search_filters_before_limit(db, db_utils):
+    with db.engine.begin() as conn:
+        conn.execute(db.Tag.__table__.insert(), [{'id': 1, 'name': 'loops'}])
+        conn.execute(db.Resource.__table__.insert(), [
+            {'id': f'r{i}', 'title': f'Python basics {i}', 'type': 'Video' if i % 2 else 'Article',
+             'level': 'beginner' if i >= 195 else 'advanced'} for i in range(200)])
+        conn.execute(db.resource_tag_association.insert(), [{'resource_id': 'r198', 'tag_id': 1}])
+
+    assert len(db_utils.search_resources('python', limit=10)) == 10
+    assert set(db_utils.search_resources('python', level='beginner', limit=10)) == {f'r{i}' for i in range(195, 200)}
+    assert set(db_utils.search_resources('pyth', level='beginner', type='Video', limit=10)) == {'r195', 'r197', 'r199'}
+    assert db_utils.search_resources('python', level='beginner', tag='loops', limit=10) == ['r198']
+
+
+def test_project_search_filters_before_limit(db, db_utils):
+    with db.engine.begin() as conn:
+        conn.execute(db.Skill.__table__.insert(), [{'id': 1, 'name': 'APIs'}])
+        conn.execute(db.Project.__table__.insert(), [
+            {'id': f'p{i}', 'title': f'Weather app {i}', 'level': 'intermediate', 'difficulty': i % 5 + 1}
+            for i in range(200)])
+        conn.execute(db.project_skill_association.insert(), [{'project_id': 'p7', 'skill_id': 1}])
+
+    assert len(db_utils.search_projects('weather', level='intermediate', limit=10)) == 10
+    assert db_utils.search_projects('weather', level='beginner', limit=10) == []
+    assert len(db_utils.search_projects('weather', difficulty=3, limit=100)) == 40
+    assert db_utils.search_projects('weather', skill='APIs', limit=10) == ['p7']